@@ -187,8 +187,7 @@ def main():
                                 option='velocity'
                                 ) for _m in _w[args.subset]]
         X = np.linspace(0, np.amax(_vel_au), 200)
-        PDF = np.array([list(map(_ii, X))
-                        for _ii in _ideal]).sum(axis=0) / len(_ideal)
+        PDF = np.array([_ii(X) for _ii in _ideal]).sum(axis=0) / len(_ideal)
         plt.plot(X, PDF, label=f'Maxwell-Boltzmann (T={args.T}K)')
 
         plt.xlabel('Velocity in a.u.')
@@ -34,6 +34,7 @@ import warnings
 import numpy as np
 
 from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
 from itertools import product, combinations_with_replacement
 from functools import partial
 
@@ -42,6 +43,7 @@ from tqdm import tqdm
 from .. import config
 
 
+@config.config_dependent
 class PALARRAY():
     '''Class for parallel processing of array data.
        Processes data in a nested grid
@@ -51,6 +53,7 @@ class PALARRAY():
                  n_cores=config.__pal_n_cores__,
                  upper_triangle=False,
                  axis=0,
+                 backend='process',
                  **kwargs):
         '''Parallel array process setup.
            With executable func(*args) and set of data arrays, data,
@@ -64,11 +67,25 @@ class PALARRAY():
            Calculate upper_triangle matrix only, if len(data)==1 and repeat==2
            (optional).
 
+           backend ... 'process' (default) or 'thread'. Threads avoid the
+                       pickling of data slices and are preferable for
+                       fine-grained NumPy functions (that release the GIL).
+
+           func is called once per index combination; reductions inside
+           func are best written without large temporaries (e.g., expand
+           |a + b|**2 into einsum terms instead of norm(a + b)).
+
            Output: array of shape (len(data[0], len(data[1]), ...)'''
 
         self.f = partial(func, **kwargs)
         self.multiple_returns = func.__annotations__.get('return') is tuple
-        self.pool = Pool(n_cores)
+        self.backend = backend
+        if backend == 'process':
+            self.pool = Pool(n_cores)
+        elif backend == 'thread':
+            self.pool = ThreadPoolExecutor(max_workers=n_cores)
+        else:
+            raise ValueError(f'unknown backend {backend}')
 
         if axis != 0:
             self.data = tuple([np.moveaxis(_d, axis, 0) for _d in data])
@@ -93,8 +110,12 @@ class PALARRAY():
             _dtype = float
             if self.multiple_returns:
                 _dtype = 'object'
+            if self.backend == 'thread':
+                _it = self.pool.map(lambda _args: self.f(*_args), self.array)
+            else:
+                _it = self.pool.istarmap(self.f, self.array)
             result = np.array(list(tqdm(
-                         self.pool.istarmap(self.f, self.array),
+                         _it,
                          desc=f'{self.f.func.__name__} (PALARRAY)',
                          total=self._length - int(
                                            self._ut *
@@ -117,8 +138,11 @@ class PALARRAY():
             print("KeyboardInterrupt in PALARRAY")
 
         finally:
-            self.pool.terminate()
-            self.pool.join()
+            if self.backend == 'thread':
+                self.pool.shutdown(cancel_futures=True)
+            else:
+                self.pool.terminate()
+                self.pool.join()
 
 
 class CORE():
@@ -186,6 +210,7 @@ class CORE():
             _func(self)
 
 
+@config.config_dependent
 class ITERATOR():
     def __init__(self, *args, **kwargs):
         self._kernel = CORE
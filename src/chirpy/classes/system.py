@@ -31,6 +31,7 @@
 import numpy as _np
 import warnings as _warnings
 import copy as _copy
+from collections import Counter as _Counter
 
 from .core import AttrDict
 from ..snippets import tracked_extract_keys as _tracked_extract_keys
@@ -44,10 +45,31 @@ from .. import constants
 from ..visualise import print_info
 
 
+# --- formats that contain vibrational modes
+_MODE_FMTS = frozenset({'molden', 'mol', 'xvibs', 'orca', 'g09', 'gaussian'})
+
+
+def _equal_sequence(a, b):
+    return len(a) == len(b) and all(_a == _b for _a, _b in zip(a, b))
+
+
+# --- type-specific comparison of topology keys (default: _equal)
+_TOPO_EQUAL = {
+        'cell_aa_deg': _np.array_equal,
+        'mol_map': _np.array_equal,
+        'symbols': _equal_sequence,
+        'names': _equal_sequence,
+        'residues': _equal_sequence,
+        }
+
+
 class _SYSTEM(_CORE):
     '''Parent class that parses and manages properties of a chemical system
        organised in attributed classes.'''
 
+    # --- set once Modes are read (avoids repeated hasattr lookups)
+    _has_modes = False
+
     def __init__(self, *args, **kwargs):
         '''Manually given arguments overwrite file attributes'''
         self._topo = kwargs.get('fn_topo')
@@ -78,12 +100,22 @@ class _SYSTEM(_CORE):
                                _ChirPyWarning,
                                stacklevel=2)
 
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        if name == 'Modes':
+            self._has_modes = False
+
     def _cell_aa_deg(self, cell_aa_deg):
+        # --- nothing to do if cell is unchanged
+        if hasattr(self, 'cell_aa_deg') \
+                and _np.array_equal(self.cell_aa_deg, cell_aa_deg) \
+                and _np.array_equal(self.XYZ.cell_aa_deg, cell_aa_deg):
+            return
         _cell = _copy.deepcopy(cell_aa_deg)
         self.cell_aa_deg = _np.array(_cell)
         # --- deep change to iterator frame
         self.XYZ._cell_aa_deg(_np.array(_cell))
-        if hasattr(self, 'Modes'):
+        if self._has_modes:
             self.Modes.cell_aa_deg = _np.array(_cell)
 
     def _check_distances(self, clean=False):
@@ -99,14 +131,7 @@ class _SYSTEM(_CORE):
         elif not hasattr(self, 'cell_aa_deg'):
             self._cell_aa_deg(self.XYZ.cell_aa_deg)
 
-        self.symbols = self.XYZ.symbols
-        # ToDo: Dict of atom kinds (with names)
-        self.kinds = AttrDict({_s: constants.elements[_s]
-                               if _s in constants.elements
-                               else 'UNKNOWN'
-                               for _s in self.symbols})
-        self.molecular_formula = AttrDict({_s: self.symbols.count(_s)
-                                           for _s in sorted(self.symbols)})
+        self._sync_kinds()
 
         if kwargs.get('sort', False):
             self.sort_atoms()
@@ -130,8 +155,18 @@ class _SYSTEM(_CORE):
         if check_consistency:
             self._check_consistency(tag=kwargs.get('tag', ''))
 
+    def _sync_kinds(self):
+        self.symbols = self.XYZ.symbols
+        # --- unique symbols in order of appearance
+        _counts = _Counter(self.symbols)
+        _get = constants.elements.get
+        # ToDo: Dict of atom kinds (with names)
+        self.kinds = AttrDict({_s: _get(_s, 'UNKNOWN') for _s in _counts})
+        self.molecular_formula = AttrDict({_s: _counts[_s]
+                                           for _s in sorted(_counts)})
+
     def _check_consistency(self, tag=''):
-        if hasattr(self, 'Modes'):
+        if self._has_modes:
             # --- ToDo: synchronize all sub-objects (pos_aa, cell_aa_deg)
             try:
                 for _attr in ['cell_aa_deg',  'pos_aa']:
@@ -143,8 +178,9 @@ class _SYSTEM(_CORE):
         if self._topo is not None:
             for _k in self._topo:
                 if _k is not None and 'topo' not in _k:
-                    _v = self.XYZ.__dict__.get(_k, self.__dict__.get(_k))
-                    if _v is not None and not _equal(_v, self._topo[_k]):
+                    _v = getattr(self.XYZ, _k, self.__dict__.get(_k))
+                    _eq = _TOPO_EQUAL.get(_k, _equal)
+                    if _v is not None and not _eq(_v, self._topo[_k]):
                         _warnings.warn('Topology file '
                                        f'{self._topo["fn_topo"]}'
                                        ' does not represent molecule '
@@ -158,7 +194,9 @@ class _SYSTEM(_CORE):
         '''return an exact copy of the iterator [BETA]
            not a deepcopy ? '''
         new = self.__new__(self.__class__)
-        new.__dict__.update(self.__dict__)
+        # --- skip cached symbol dicts (invalidated by mutations of new)
+        new.__dict__.update({_k: _v for _k, _v in self.__dict__.items()
+                             if _k not in ('kinds', 'molecular_formula')})
         new.XYZ = self.XYZ._copy()  # necessary to split iterator
         return new
 
@@ -167,9 +205,8 @@ class _SYSTEM(_CORE):
         new = self._copy()
         new.mol_map = None
         new.XYZ.merge(other.XYZ, axis=0)
-        new.symbols = new.XYZ.symbols
+        new._sync_kinds()
         # new.names = new.XYZ.names
-        # new.kinds ...
         # re-define molecules to get a clean mol_map
         new.define_molecules()
         new._check_consistency()
@@ -180,9 +217,10 @@ class _SYSTEM(_CORE):
         self.XYZ = self._XYZ(*args, **kwargs)
         fmt = self.XYZ._fmt
 
-        if fmt in ['molden', 'mol', 'xvibs', 'orca', 'g09', 'gaussian']:
+        if fmt in _MODE_FMTS:
             try:
                 self.Modes = VibrationalModes(*args, **kwargs)
+                self._has_modes = True
             except NameError:
                 pass
 
@@ -222,13 +260,17 @@ class _SYSTEM(_CORE):
         elif not isinstance(times, tuple):
             raise TypeError('expected integer or tuple for times argument')
 
+        n_times = int(_np.prod(times))
+        if n_times == 1 and not kwargs:
+            return
+
         self.XYZ.repeat(times, unwrap_ref=unwrap_ref, priority=priority)
         self.mol_map = None
         if hasattr(self.XYZ, 'residues'):
             del self.XYZ._frame.residues
             del self.XYZ.residues
 
-        if hasattr(self, 'Modes'):
+        if self._has_modes:
             self.Modes.repeat(times, unwrap_ref=unwrap_ref, priority=priority)
 
         # --- repeat initialisation
@@ -238,14 +280,15 @@ class _SYSTEM(_CORE):
         if self._topo is not None:
             for _k in self._topo:
                 if _k in ['symbols', 'names', 'residues']:
-                    self._topo[_k] *= _np.prod(times)
+                    self._topo[_k] *= n_times
                 elif _k == 'cell_aa_deg':
-                    for _i in [0, 1, 2]:
-                        self._topo['cell_aa_deg'][_i] *= times[_i]
+                    self._topo[_k] = _np.array(self._topo[_k], dtype=float)
+                    self._topo[_k][:3] *= times
                 elif _k == 'mol_map':
-                    _n = len(set(self._topo[_k]))
-                    for _z in range(1, _np.prod(times)):
-                        self._topo[_k] += [_i+_z*_n for _i in self._topo[_k]]
+                    _map = _np.array(self._topo[_k])
+                    _shift = len(set(self._topo[_k])) * _np.arange(n_times)
+                    self._topo[_k] = (_map[None] + _shift[:, None]
+                                      ).ravel().tolist()
 
         self._sync_class(tag='repeat', **kwargs)
 
@@ -275,7 +318,7 @@ class _SYSTEM(_CORE):
         atoms  ...  list of atomic indices
         '''
         self.XYZ.split(_np.arange(len(self.symbols)), select=atoms)
-        if hasattr(self, 'Modes'):
+        if self._has_modes:
             self.Modes.split(_np.arange(len(self.symbols)), select=atoms)
 
         if self.mol_map is not None:
@@ -302,13 +345,9 @@ class _SYSTEM(_CORE):
         '''Update residue numbers in XYZ (but not names!).
            Modes not supported.'''
 
-        if hasattr(self.XYZ, 'residues'):
-            self.XYZ.residues = tuple([[_im+1, _resn]
-                                       for _im, (_resid, _resn) in
-                                       zip(self.mol_map, self.XYZ.residues)])
-
-        else:
-            self.XYZ.residues = tuple([[_im+1, 'MOL'] for _im in self.mol_map])
+        self.XYZ.residue_id = (_np.asarray(self.mol_map) + 1).astype(_np.int32)
+        if not hasattr(self.XYZ, 'residue_name'):
+            self.XYZ.residue_name = _np.full(len(self.mol_map), 'MOL')
 
     def sort_atoms(self, slist=None):
         '''Sort atoms alphabetically (default)'''
@@ -317,7 +356,7 @@ class _SYSTEM(_CORE):
         # self.XYZ.sort(slist)
         self.symbols = self.XYZ.symbols
 
-        if hasattr(self, 'Modes'):
+        if self._has_modes:
             self.Modes.sort(slist)
 
         if self.mol_map is not None:
@@ -372,7 +411,7 @@ class _SYSTEM(_CORE):
         '''Write entire XYZ/Modes content to file (frame or trajectory).'''
 
         nargs = self._parse_write_args(fn, **kwargs)
-        if hasattr(self, 'Modes'):
+        if self._has_modes:
             self.Modes.write(fn, **nargs)
         else:
             self.XYZ.write(fn, **nargs)
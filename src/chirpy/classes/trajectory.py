@@ -95,10 +95,14 @@ class _FRAME(_CORE):
             raise TypeError('Expected tuple for symbols attribute. '
                             f'Got {self.symbols.__class__.__name__}')
         # --- optional attributes (symbols analogues)
-        for key in ['names', 'residues']:
+        if not isinstance((_oa := getattr(self, 'names', None)),
+                          (tuple, type(None))):
+            raise TypeError('Expected tuple for names attribute. '
+                            f'Got {_oa.__class__.__name__}')
+        for key in ['residue_id', 'residue_name']:
             if not isinstance((_oa := getattr(self, key, None)),
-                              (tuple, type(None))):
-                raise TypeError(f'Expected tuple for {key} attribute. '
+                              (_np.ndarray, type(None))):
+                raise TypeError(f'Expected numpy array for {key} attribute. '
                                 f'Got {_oa.__class__.__name__}')
         self.n_atoms, self.n_fields = self.data.shape
         if self.n_atoms != len(self.symbols):
@@ -117,9 +121,14 @@ class _FRAME(_CORE):
 
         # --- symbol analogues
         if _l == 'symbols':
-            for _l in ['names', 'residues']:
+            try:
+                new.names = self.names + other.names
+            except AttributeError:
+                pass
+            for _l in ['residue_id', 'residue_name']:
                 try:
-                    setattr(new, _l, getattr(self, _l) + getattr(other, _l))
+                    setattr(new, _l, _np.concatenate((getattr(self, _l),
+                                                      getattr(other, _l))))
                 except AttributeError:
                     pass
 
@@ -163,10 +172,13 @@ class _FRAME(_CORE):
         self.data = _np.take(self.data, _slist, axis=-2)
         self.symbols = tuple(_symbols[_slist])
         # --- symbols analogues
-        for _l in ['names', 'residues']:
+        try:
+            self.names = tuple(_np.array(self.names)[_slist].tolist())
+        except AttributeError:
+            pass
+        for _l in ['residue_id', 'residue_name']:
             try:
-                setattr(self, _l, tuple(_np.array(getattr(self,
-                                        _l))[_slist].tolist()))
+                setattr(self, _l, getattr(self, _l)[_slist])
             except AttributeError:
                 pass
         self._sync_class()
@@ -189,18 +201,10 @@ class _FRAME(_CORE):
            selection keyword in write().
 
            select ... list or tuple of ids'''
-        _data = mapping.dec(self.data, mask, axis=-2)
-        _symbols = mapping.dec(self.symbols, mask)
-
-        _DEC = (_data, _symbols)
-
         # --- ToDo: Generalise optional attributes
-        optattrs = []
-        for _l in ['names', 'residues']:  # , 'eival_cgs']:
-            if hasattr(self, _l):
-                optattrs.append(_l)
-                _dl = mapping.dec(getattr(self, _l), mask)
-                _DEC += (_dl,)
+        optattrs = [_l for _l in ['names', 'residue_id', 'residue_name']
+                    # , 'eival_cgs']
+                    if hasattr(self, _l)]
 
         def create_obj(_d, _s, *optargs):
             nargs = {}
@@ -212,8 +216,11 @@ class _FRAME(_CORE):
             return _obj
 
         if select is None:
+            _DEC = (mapping.dec(self.data, mask, axis=-2),
+                    mapping.dec(self.symbols, mask))
+            _DEC += tuple(mapping.dec(getattr(self, _l), mask)
+                          for _l in optattrs)
             _new = []
-            # for _d, _s in zip(_data, _symbols):
             for _D in zip(*_DEC):
                 _new.append(create_obj(*_D))
             return _new
@@ -223,16 +230,26 @@ class _FRAME(_CORE):
             elif not isinstance(select, list):
                 raise TypeError('Expected list or integer for select '
                                 'argument!')
-            _iselect = [_i for _i, _m in enumerate(set(mask)) if _m in select]
-            if len(_iselect) > 0:
-                # _new = create_obj(_data[_iselect[0]], _symbols[_iselect[0]])
-                _new = create_obj(*[_D[_iselect[0]] for _D in _DEC])
-                for _id in _iselect[1:]:
-                    # _new += create_obj(_data[_id], _symbols[_id])
-                    _new += create_obj(*[_D[_id] for _D in _DEC])
-            else:
+            _mask = _np.array(mask)
+            _keys = [_m for _m in _np.unique(_mask) if _m in select]
+            if len(_keys) == 0:
                 raise ValueError('Selection does not correspond to any '
                                  'mask entry!')
+            # --- atom indices grouped by mask entry (order as in dec)
+            _ind = _np.concatenate([_np.flatnonzero(_mask == _m)
+                                    for _m in _keys])
+            # --- contiguous selection: slice data (view) instead of copy
+            if _np.all(_np.diff(_ind) == 1):
+                _ind = slice(_ind[0], _ind[-1] + 1)
+
+            def _pick(_l):
+                if isinstance(_ind, slice) or isinstance(_l, _np.ndarray):
+                    return _l[_ind]
+                return tuple(_l[_i] for _i in _ind)
+
+            _new = create_obj(self.data.swapaxes(0, -2)[_ind].swapaxes(0, -2),
+                              *[_pick(getattr(self, _l))
+                                for _l in ['symbols'] + optattrs])
             self.__dict__.update(_new.__dict__)
             self._sync_class()
 
@@ -574,7 +591,32 @@ class _XYZ():
     '''Convention (at the moment) of data attribute:
        col 1-3: pos in aa; col 4-6: vel in au.
        pos_aa/vel_au attributes are protected, use underscored
-       attributes for changes.'''
+       attributes for changes.
+       Residues are stored as arrays residue_id and residue_name.'''
+
+    @property
+    def residues(self):
+        '''Legacy view of residue_id/residue_name: tuple of [id, name]'''
+        try:
+            return tuple([[int(_i), str(_n)] for _i, _n in
+                          zip(self.residue_id, self.residue_name)])
+        except AttributeError:
+            raise AttributeError(f'{self.__class__.__name__} object has '
+                                 'no attribute residues')
+
+    @residues.setter
+    def residues(self, residues):
+        if len(residues) == 0:
+            _resids, _resns = (), ()
+        else:
+            _resids, _resns = zip(*residues)
+        self.residue_id = _np.array(_resids).astype(_np.int32)
+        self.residue_name = _np.array(_resns).astype(str)
+
+    @residues.deleter
+    def residues(self):
+        del self.residue_id
+        del self.residue_name
 
     def _import_frame(self, *args, **kwargs):
         clean_velocities = kwargs.pop('clean_velocities', False)
@@ -825,6 +867,9 @@ class _XYZ():
             self.names = tuple(names)
         if residues is not None:
             self.residues = tuple(residues)
+        elif (_resids := kwargs.get('residue_id')) is not None:
+            self.residue_id = _np.array(_resids).astype(_np.int32)
+            self.residue_name = _np.array(kwargs['residue_name']).astype(str)
         if types is not None:
             self.types = tuple(types)
         if connectivity is not None:
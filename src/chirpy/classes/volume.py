@@ -680,11 +680,10 @@ class VectorField(ScalarField):
     @staticmethod
     def _helmholtz_components(data, cell_vec_aa):
         div, rot = divrot(data, cell_vec_aa)
-        V = _k_potential(div, _np.array(cell_vec_aa))[1]/(4*_np.pi)
-        A1 = _k_potential(rot[0], _np.array(cell_vec_aa))[1]
-        A2 = _k_potential(rot[1], _np.array(cell_vec_aa))[1]
-        A3 = _k_potential(rot[2], _np.array(cell_vec_aa))[1]
-        A = _np.array([A1, A2, A3])/(4*_np.pi)
+        # --- one batched transform for div and the three rot components
+        V, *A = _k_potential(_np.concatenate((div[None], rot)),
+                             _np.array(cell_vec_aa))[1] / (4*_np.pi)
+        A = _np.array(A)
         irrotational_field = -_np.array(_np.gradient(V,
                                                      cell_vec_aa[0][0],
                                                      cell_vec_aa[1][1],
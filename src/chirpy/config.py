@@ -33,6 +33,7 @@ import importlib
 import warnings
 import multiprocessing
 import platform
+from types import ModuleType
 
 from . import __version__ as version
 
@@ -49,13 +50,54 @@ def version_info():
     return tuple([int(_v) for _v in version.split('.')])
 
 
+_cfg_dependents = set()
+
+
+def config_dependent(obj):
+    '''Decorator registering the module of obj as dependent on config,
+       i.e. the module bakes in __pal_n_cores__/__verbose__ at import time
+       (e.g., as default arguments) and has to be reloaded on change.'''
+    _cfg_dependents.add(obj.__module__)
+    return obj
+
+
+def _stale_modules():
+    '''Registered modules and all loaded chirpy modules holding objects
+       of them (transitively).'''
+    modules = tuple(module for module in tuple(sys.modules.values())
+                    if 'chirpy.' in (module_name := module.__name__)
+                    and 'config' not in module_name)
+    stale = _cfg_dependents.intersection(sys.modules)
+
+    def _refers(module):
+        for _v in tuple(vars(module).values()):
+            if isinstance(_v, ModuleType):
+                if _v.__name__ in stale:
+                    return True
+            elif getattr(_v, '__module__', None) in stale:
+                return True
+        return False
+
+    _changed = True
+    while _changed:
+        _changed = False
+        for module in modules:
+            if module.__name__ not in stale and _refers(module):
+                stale.add(module.__name__)
+                _changed = True
+
+    return tuple(module for module in modules if module.__name__ in stale)
+
+
 def _reload_modules():
-    # --- apply changes to loaded modules
-    modules = tuple(sys.modules.values())
-    for module in modules:
-        if 'chirpy.' in (module_name := module.__name__) \
-         and 'config' not in module_name:
-            importlib.reload(module)
+    # --- apply changes to loaded modules that depend on config
+    #     (deeper first, so that packages re-export the reloaded objects of
+    #     their submodules)
+    def _depth(module):
+        return module.__name__.count('.')
+
+    for module in sorted(_stale_modules(), key=_depth, reverse=True):
+        importlib.reload(module)
 
 
 def set_pal_n_cores(s, reload_modules=True):
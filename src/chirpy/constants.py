@@ -295,7 +295,12 @@ for _z, _ZV in _ZV_list:
 
 def _get_property(kinds, key, fmt=None, fill_value=None):
     pr = []
+    # --- resolve every distinct kind only once
+    _resolved = {}
     for _k in kinds:
+        if _k in _resolved:
+            pr.append(_resolved[_k])
+            continue
         try:
             _guess = _k.title()
         except AttributeError:
@@ -325,9 +330,9 @@ def _get_property(kinds, key, fmt=None, fill_value=None):
                     break
 
         if fmt is not None:
-            pr.append(fmt(_r))
-        else:
-            pr.append(_r)
+            _r = fmt(_r)
+        _resolved[_k] = _r
+        pr.append(_r)
     # if config.__verbose__:
     #     _warnings.warn(f'Got {key} of {kinds}: {pr}',
     #                    config.ChirPyWarning, stacklevel=3)
@@ -30,10 +30,12 @@
 
 import os as _os
 import copy as _copy
+import subprocess as _subprocess
 import numpy as _np
 import warnings as _warnings
+from collections import defaultdict as _defaultdict
+from functools import lru_cache as _lru_cache
 
-from ..topology.dissection import assign_molecule as _assign_molecule
 from ..topology.dissection import define_molecules as _define_molecules
 from ..topology.mapping import cell_vec as _cell_vec
 from ..topology.mapping import cell_l_deg as _get_cell_aa_deg
@@ -46,6 +48,48 @@ from ..visualise import print_info
 from ..config import ChirPyWarning as _ChirPyWarning
 
 
+@_lru_cache(maxsize=128)
+def _symmetry_from_bytes(cell_bytes):
+    return _get_symmetry(_np.frombuffer(cell_bytes))
+
+
+def _symmetry(cell_aa_deg):
+    '''Lattice system of cell_aa_deg, memoised by its raw bytes'''
+    if cell_aa_deg is None:
+        return None
+    return _symmetry_from_bytes(
+                _np.asarray(cell_aa_deg, dtype=float).tobytes())
+
+
+def _equal_members(ref, others):
+    '''Compare ref with each of others'''
+    return [bool(ref._is_equal(_m, noh=True, atol=2.)[0]) for _m in others]
+
+
+class _UnionFind():
+    '''Disjoint-set forest with path halving and union by rank.'''
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return
+        if self.rank[x] < self.rank[y]:
+            x, y = y, x
+        self.parent[y] = x
+        if self.rank[x] == self.rank[y]:
+            self.rank[x] += 1
+
+
 class _BoxObject(_CORE):
 
     # --- DEV log
@@ -68,7 +112,7 @@ class _BoxObject(_CORE):
         self.pbc = kwargs.get('pbc', True)
         if len(args) != 0:
             self.__dict__.update(self.read(*args, **kwargs).__dict__)
-        self.symmetry = kwargs.get('symmetry', _get_symmetry(self.cell_aa_deg))
+        self.symmetry = kwargs.get('symmetry', _symmetry(self.cell_aa_deg))
         _BoxObject._sync_class(self)
         self.cell_vec_aa = self._cell_vec_aa(**kwargs)
         self.volume_aa3 = self._volume_aa3()
@@ -104,28 +148,49 @@ class _BoxObject(_CORE):
 
     def _cell_aa_deg(self):
         if hasattr(self, 'cell_aa_deg'):
-            if _get_symmetry(self.cell_aa_deg) not in [
+            if _symmetry(self.cell_aa_deg) not in [
                     None, 'void']:
                 return self.cell_aa_deg
         if hasattr(self, 'cell_vec_aa'):
             return _get_cell_aa_deg(self.cell_vec_aa)
 
     def _volume_aa3(self):
-        return _np.dot(self.cell_vec_aa[0],
-                       _np.cross(self.cell_vec_aa[1], self.cell_vec_aa[2]))
+        # --- scalar triple product a · (b × c)
+        (ax, ay, az), (bx, by, bz), (cx, cy, cz) = self.cell_vec_aa
+        return ax * (by * cz - bz * cy) \
+            + ay * (bz * cx - bx * cz) \
+            + az * (bx * cy - by * cx)
+
+    def _member_masses_amu(self):
+        '''Molar masses of the member_set species (cached per member)'''
+        _cache = self.__dict__.get('_mass_cache', {})
+        self._mass_cache = {}
+        for _n, _m in self.member_set:
+            # --- keep reference to member so that its id stays unique
+            _c = _cache.get(id(_m))
+            if _c is None or _c[0] is not _m:
+                _c = (_m, _m.masses_amu.sum())
+            self._mass_cache[id(_m)] = _c
+        return [self._mass_cache[id(_m)][1] for _n, _m in self.member_set]
 
     def _sync_class(self):
         '''Calculates intensive properties only'''
         self.n_members = len(self.members)
-        self.mass_amu = sum([_n * sum(_m.masses_amu)
-                             for _n, _m in self.member_set])
-        self.n_atoms = sum([_n * _m.n_atoms for _n, _m in self.members])
+        _n = _np.fromiter((_n for _n, _m in self.member_set),
+                          dtype=float,
+                          count=len(self.member_set))
+        self.mass_amu = _n @ _np.array(self._member_masses_amu(), dtype=float)
+        _n, _n_at = _np.fromiter(
+                ((_n, _m.n_atoms) for _n, _m in self.members),
+                dtype=_np.dtype((int, 2)),
+                count=self.n_members).T
+        self.n_atoms = int(_n @ _n_at)
         try:
             self.cell_aa_deg = self._cell_aa_deg()
         except AttributeError:
             pass
         if not hasattr(self, 'symmetry'):
-            self.symmetry = _get_symmetry(self.cell_aa_deg)
+            self.symmetry = _symmetry(self.cell_aa_deg)
     # def routine: check all xx attributes against _xx() methods
 
     def split_members(self):
@@ -145,43 +210,79 @@ class _BoxObject(_CORE):
     def _clean_members(self):
         if self.n_members == 0:
             return None
-        _eq = _np.zeros((self.n_members,) * 2)
+        if self.n_members == 1:
+            # --- single component: nothing to compare or wrap
+            _n, _m = self.members[0]
+            self.member_set = [(int(_n), _m)]
+            self._sync_class()
+            return None
 
-        if self.n_members > 1:
-            for _i, _m in self.members:
-                _m.wrap_molecules(_np.zeros((_m.n_atoms)).astype(int))
+        for _i, _m in self.members:
+            _m.wrap_molecules(_np.zeros((_m.n_atoms)).astype(int))
 
+        # --- bucket members by invariants that equal members must share
+        #     (see _is_similar) and compare only within buckets
+        _buckets = _defaultdict(list)
         for _ii, (_i, _m) in enumerate(self.members):
-            _eq[_ii, _ii:] = _np.array([
-                          bool(_m._is_equal(_n, noh=True, atol=2.)[0])
-                          for _j, _n in self.members[_ii:]
-                          ])
+            _buckets[(_m._type, _m.n_fields, tuple(sorted(_m.symbols)))
+                     ].append(_ii)
 
-        _eq = [_np.argwhere(_ee == 1.0).flatten().tolist() for _ee in _eq]
         _N = self.n_members
-        _M = self.n_members
-        _ass = _np.zeros((_N)).astype(int)
-        _sp = 0
-        for _im in range(_N):
-            if _ass[_im] == 0:
-                _sp += 1
-                _ass, _M = _assign_molecule(_ass, _sp, _N, _eq, _im, _M)
-            if _M == 0:
-                break
-        _n, _m = _np.array(self.members).T
-        self.member_set = [(_n[_ass == _i].sum(), _m[_ass == _i][0])
-                           for _i in _np.unique(_ass)]
+        _uf = _UnionFind(_N)
+        for _bucket in _buckets.values():
+            # --- compare all pairs within the bucket (_is_equal is a
+            #     tolerance test and not transitive), skipping pairs that
+            #     are already connected
+            for _k, _ii in enumerate(_bucket):
+                _others = [_jj for _jj in _bucket[_k+1:]
+                           if _uf.find(_ii) != _uf.find(_jj)]
+                _eq = _equal_members(self.members[_ii][1],
+                                     [self.members[_jj][1] for _jj in _others])
+                for _jj, _e in zip(_others, _eq):
+                    if _e:
+                        _uf.union(_ii, _jj)
+
+        _ass = _np.array([_uf.find(_ii) for _ii in range(_N)])
+        _roots, _first, _inv = _np.unique(_ass,
+                                          return_index=True,
+                                          return_inverse=True)
+        _counts = _np.zeros(len(_roots), dtype=int)
+        _n, _m = zip(*self.members)
+        _np.add.at(_counts, _inv, _np.fromiter(_n, dtype=int, count=_N))
+        self.member_set = [(int(_counts[_i]), _m[_first[_i]])
+                           for _i in _np.argsort(_first)]
         self._sync_class()
 
+    @staticmethod
+    def _copy_members(members):
+        '''Copy member frames (_clean_members wraps them in place)'''
+        return [(_n, _copy.deepcopy(_m)) for _n, _m in members]
+
+    def clone(self, members=None):
+        '''Return a structural copy of the box. Member frames, member lists
+           and cell arrays are copied.
+           members: list of (n, XYZFrame object) tuples to install instead
+                    of the own members (frames are copied)'''
+        new = self.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        if members is None:
+            members = self.members
+        new.members = self._copy_members(members)
+        new.member_set = list(self.member_set)
+        for _k in ('origin_aa', 'cell_aa_deg', 'cell_vec_aa'):
+            if isinstance(_v := getattr(self, _k, None), _np.ndarray):
+                setattr(new, _k, _v.copy())
+        return new
+
     def __add__(self, other):
         '''Combine members of different systems'''
         if not isinstance(other, _BoxObject):
             raise TypeError('unsupported operand type(s) for +: '
                             '\'%s\' and \'%s\''
                             % (type(self).__name__, type(other).__name__))
-        new = _copy.deepcopy(self)
+        new = self.clone()
         if _np.allclose(self.cell_vec_aa, other.cell_vec_aa):
-            new.members += other.members
+            new.members += self._copy_members(other.members)
         else:
             raise AttributeError('The two objects have different '
                                  'cell attributes!')
@@ -192,10 +293,13 @@ class _BoxObject(_CORE):
 
     def __mul__(self, other):
         '''Multiply system keeping box size constant'''
-        new = _copy.deepcopy(self)
         if isinstance(other, int):
-            for _i in range(other-1):
-                new += self
+            if other > 1:
+                new = self.clone(members=self.members * other)
+                new._sync_class()
+                new._clean_members()
+            else:
+                new = self.clone()
         # elif isinstance(other, _BoxObject):
         # ToDo: connect it to pow
         else:
@@ -212,25 +316,22 @@ class _BoxObject(_CORE):
             raise TypeError('unsupported operand type(s) for *: '
                             '\'%s\' and \'%s\''
                             % (type(self).__name__, type(other).__name__))
-        new = _copy.deepcopy(self)
+        new = self.clone(members=self.members * other)
         del new.cell_aa_deg, new.cell_vec_aa
-        new.members *= other
-        new._cell_vec_aa = lambda: other ** (1/3) * self._cell_vec_aa()
-        new.cell_vec_aa = new._cell_vec_aa()
+        # --- scale cell and volume directly
+        new.cell_vec_aa = other ** (1/3) * self.cell_vec_aa
         new.cell_aa_deg = new._cell_aa_deg()
-        new.volume_aa3 = new._volume_aa3()
+        new.volume_aa3 = other * self.volume_aa3
         new._sync_class()
         new._clean_members()
         return new
 
     def _mol_map(self):
-        _imol = 0
-        mol_map = []
-        for _m in self.member_set:
-            for _i in range(_m[0]):
-                mol_map += _m[1].n_atoms * [_imol]
-                _imol += 1
-        return _np.array(mol_map)
+        _n = _np.array([_m[0] for _m in self.member_set], dtype=int)
+        _n_at = _np.array([_m[1].n_atoms for _m in self.member_set],
+                          dtype=int)
+        # --- atoms per molecule, then one molecule id per atom
+        return _np.repeat(_np.arange(_n.sum()), _np.repeat(_n_at, _n))
 
     def print_info(self) -> None:
         # ToDo: use self._print_info = [print_info.XXX]
@@ -245,8 +346,9 @@ class _BoxObject(_CORE):
         print('\n'.join(['%45s %8d %12.4f' %
                          (getattr(_m[1], '_fn', ''),
                           _m[0],
-                          sum(_m[1].masses_amu))
-                         for _m in self.member_set]))
+                          _mass)
+                         for _m, _mass in zip(self.member_set,
+                                              self._member_masses_amu())]))
         print(77 * '–')
 
     def create(self, **kwargs):
@@ -270,7 +372,7 @@ class MolecularCrystal(_BoxObject):
             raise ValueError('%s requires valid cell dimensions!'
                              % self.__class__.__name__)
 
-        self.lattice = _get_symmetry(self.cell_aa_deg)
+        self.lattice = _symmetry(self.cell_aa_deg)
         _BoxObject._sync_class(self)
 
     def propagate(self, frame, multiply=(1, 1, 1), priority=(0, 1, 2)):
@@ -358,16 +460,14 @@ class Solution(_BoxObject):
         # default: set lowest c to 1
         _n = (self.c_mol_L + [_c_slv_mol_L]) / _c_min_mol_L
 
-        def _dev_warning(_d, _id):
-            with _warnings.catch_warnings():
-                if _d > 0.01:
-                    _warnings.warn('Member counts differ from input value by '
-                                   'more than 1%%:\n  - %s\n' % _id,
-                                   _ChirPyWarning,
-                                   stacklevel=2)
-        [_dev_warning(abs(round(_in) - _in) /
-                      _in, ([self.solvent] + self.solutes)[_ii])
-         for _ii, _in in enumerate(_n)]
+        # --- warn for members whose rounded counts deviate by more than 1%
+        #     (same order as _n: solutes, then solvent)
+        _ids = self.solutes + [self.solvent]
+        for _ii in _np.flatnonzero(_np.abs(_np.round(_n) - _n) / _n > 0.01):
+            _warnings.warn('Member counts differ from input value by '
+                           'more than 1%%:\n  - %s\n' % _ids[_ii],
+                           _ChirPyWarning,
+                           stacklevel=2)
 
         nargs = {_k: kwargs.get(_k) for _k in kwargs.keys()
                  if _k not in [
@@ -387,7 +487,7 @@ class Solution(_BoxObject):
                                  for _in, _is in zip(_n, _slt + [_slv])],
                         **nargs)  # by definition solvent is the last member
 
-        del _slt, _slv, _c_slv_mol_L, _n, _c_min_mol_L, _dev_warning
+        del _slt, _slv, _c_slv_mol_L, _n, _c_min_mol_L, _ids
 
     @classmethod
     def read(cls, fn, **kwargs):
@@ -408,8 +508,9 @@ class Solution(_BoxObject):
                                  (constants.avog * 1E-24)) ** (1/3)])
 
     def _c_mol_L(self):
-        return [_m[0] / (constants.avog * 1E-27) / self.volume_aa3
-                for _m in self.member_set]
+        _n = _np.fromiter((_m[0] for _m in self.member_set), dtype=float,
+                          count=len(self.member_set))
+        return (_n / (constants.avog * 1E-27) / self.volume_aa3).tolist()
 
     def _rho_g_cm3(self):
         return self.mass_amu / (constants.avog * 1E-24) / self.volume_aa3
@@ -460,22 +561,25 @@ class Solution(_BoxObject):
 
         if verbose:
             print("Calling packmol ... (see packmol.log)")
-        _err = _os.system("packmol < packmol.inp > packmol.log")
-        if _err == 32512:
-            raise ImportError("could not fill box. Is packmol installed?")
-        elif _err != 0:
+        with open('packmol.inp') as _inp, open('packmol.log', 'w') as _log:
+            try:
+                _err = _subprocess.run(['packmol'], stdin=_inp, stdout=_log,
+                                       check=False).returncode
+            except FileNotFoundError:
+                raise ImportError("could not fill box. Is packmol installed?")
+        if _err != 0:
             raise ValueError("unexpected packmol error")
 
         if verbose:
             print("Done.")
 
+        self.mol_map = self._mol_map()
         with _warnings.catch_warnings():
             _warnings.filterwarnings('ignore', category=_ChirPyWarning)
             _load = _Molecule(".simbox.pdb",
                               cell_aa_deg=self._cell_aa_deg(),
-                              mol_map=self._mol_map())
+                              mol_map=self.mol_map)
 
-        self.mol_map = self._mol_map()
         # _load.define_molecules(silent=True)
         _load.sort_atoms(_np.argsort(_load.mol_map, kind='stable'))
         # if self.pbc:
@@ -491,7 +595,4 @@ class Solution(_BoxObject):
             _os.remove(".member-%03d.pdb" % _im)
         _os.remove(".simbox.pdb")
 
-        #with _warnings.catch_warnings():
-        #    _warnings.filterwarnings('ignore', category=_ChirPyWarning)
-        #    _load = _Molecule("topology.pdb")
-        return _Molecule("topology.pdb")
+        return _load
@@ -198,15 +198,15 @@ def cpmdWriter(fn, data, selection=None, append=False, **kwargs):
     if append:
         mode = 'a'
 
+    # --- one format string per line, filled with rows of the frame
+    _fmt = '%7d  ' + '  '.join(['%20.12f'] * 3) + '  ' \
+        + '  '.join(['%20.12f'] * (data.shape[-1] - 3)) + '\n'
     with open(fn, mode) as f:
         for fr, _d in zip(frames, data):
-            for _i in _range:
-                line = '%7d  ' % fr \
-                    + '  '.join(map('{:20.12f}'.format,
-                                _d[_i][:3]*constants.l_aa2au)) + '  '\
-                    + '  '.join(map('{:20.12f}'.format, _d[_i][3:]))
-
-                f.write(line+'\n')
+            _d = _d[_range]
+            _d = np.concatenate((_d[:, :3]*constants.l_aa2au, _d[:, 3:]),
+                                axis=-1)
+            f.write(''.join([_fmt % (fr, *_row) for _row in _d.tolist()]))
 
     if bool_atoms and mode != 'a':
         symbols = kwargs.pop('symbols', ())
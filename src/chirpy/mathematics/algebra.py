@@ -32,8 +32,6 @@
 import numpy as np
 from scipy.interpolate import RegularGridInterpolator
 
-from ..constants import eijk
-
 
 def dot(vector0, vector1):
     '''v0 · v1 with vectors v0/v1 of shape ([n_frames, n_units], 3)
@@ -67,13 +65,9 @@ def cross(vector0, vector1):
         raise ValueError('operands cannot be broadcast together with shapes '
                          f'{s0} {s1}')
 
-    if s0 == 1:
-        return np.cross(v0, v1)
-    else:
-        return np.sum(eijk
-                      * v0[..., :, None, None]
-                      * v1[..., None, :, None],
-                      axis=(s0-1, s0))
+    # --- NB: np.cross evaluates the six products directly (no Levi-Civita
+    #         tensor temporaries) and broadcasts over leading axes
+    return np.cross(v0, v1, axis=-1)
 
 
 def vector(*args):
@@ -267,8 +261,8 @@ def change_euclidean_basis(v, basis):
     M[2] = cross(basis[0], basis[1])
     V = dot(basis[0], cross(basis[1], basis[2]))
 
-    # direction cosine
-    return 1 / V * np.tensordot(v, M, axes=(-1, 1))
+    # direction cosine (scale the dual basis, not the result)
+    return np.tensordot(v, M / V, axes=(-1, 1))
 
 
 def kabsch_algorithm(P, ref):
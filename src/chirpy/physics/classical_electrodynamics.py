@@ -181,10 +181,7 @@ def biot_savart_kspace(j, cell_vec_au, voxel):
     div, rot = divrot(j, cell_vec_au)
 
     # G != 0
-    B1 = kspace.k_potential(rot[0], cell_vec_au)[1]
-    B2 = kspace.k_potential(rot[1], cell_vec_au)[1]
-    B3 = kspace.k_potential(rot[2], cell_vec_au)[1]
-    B = np.array([B1, B2, B3]) / (4 * np.pi)
+    B = kspace.k_potential(rot, cell_vec_au)[1] / (4 * np.pi)
     # this 4 pi division should be done in kspace binary already?
 
     # G == 0 ???
@@ -29,8 +29,12 @@
 # ----------------------------------------------------------------------
 
 
+from functools import lru_cache
 import numpy as np
-from numpy.fft import fftfreq, ifftn, fftn
+from numpy.fft import fftfreq, rfftfreq
+from scipy.fft import rfftn, irfftn
+
+from .. import config
 
 
 def k_get_cell(n1, n2, n3, a1, a2, a3):
@@ -58,11 +62,35 @@ def _k_v1(k):
         return np.where(k == 0.0, 0.0, np.divide(4.0 * np.pi, k**2))
 
 
+@lru_cache(maxsize=8)
+def _k_grid(n1, n2, n3, a1, a2, a3):
+    '''Real-space distances and Coulomb kernel on the half-spectrum grid
+       of rfftn (cached for repeated calls on the same grid).'''
+    R = k_get_cell(n1, n2, n3, a1, a2, a3)[0]
+    k1 = 2 * np.pi * fftfreq(n1, a1 / n1)
+    k2 = 2 * np.pi * fftfreq(n2, a2 / n2)
+    k3 = 2 * np.pi * rfftfreq(n3, a3 / n3)
+    K = np.sqrt(k1[:, None, None]**2 + k2[None, :, None]**2
+                + k3[None, None, :]**2)
+    R.flags.writeable = False
+    V_K = _k_v1(K)
+    V_K.flags.writeable = False
+
+    return R, V_K
+
+
 def k_potential(data, cell_au):
-    n1, n2, n3 = data.shape
+    '''Solve the Poisson equation for data on a periodic grid.
+       Leading axes of data (e.g., vector components) are transformed
+       together; the grid is given by the last three axes.'''
+    n1, n2, n3 = data.shape[-3:]
     a1, a2, a3 = tuple(cell_au.diagonal())
-    R, K = k_get_cell(n1, n2, n3, a1 * n1, a2 * n2, a3 * n3)
-    V_R = ifftn(_k_v1(K) * fftn(data)).real
+    R, V_K = _k_grid(n1, n2, n3, a1 * n1, a2 * n2, a3 * n3)
+    _axes = (-3, -2, -1)
+    _workers = config.__pal_n_cores__
+    V_R = irfftn(V_K * rfftn(data, axes=_axes, workers=_workers),
+                 s=(n1, n2, n3), axes=_axes, overwrite_x=True,
+                 workers=_workers)
 
     return R, V_R
 
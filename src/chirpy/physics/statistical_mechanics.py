@@ -55,37 +55,38 @@ def maxwell_boltzmann_distribution(T_K, *args, option='energy'):
     '''Return the Maxwell-Boltzmann distribution function for given temperature
        in K and species with masses in a.m.u.'''
 
-    def _velocity_distribution(T_K, vel_norm_au, mass_amu):
+    beta = constants.k_B_au * T_K
+
+    # --- prefactors are evaluated once; the returned PDF accepts arrays
+    def _velocity_distribution(mass_amu):
         '''Returns the probability density of a given velocity in a.u. of a
            particle with mass in a.m.u. at a given temperature in K.
            Accepts np.arrays of species if shapes of vel and mass are equal.'''
         m_au = mass_amu * constants.m_amu_au
-        beta = constants.k_B_au * T_K
-
         N = np.sqrt(2 / np.pi) * pow(m_au / beta, 3.0/2.0)
-        p1 = np.exp(-(m_au * vel_norm_au**2) / (2 * beta))
 
-        return N * p1 * vel_norm_au**2
+        def PDF(vel_norm_au):
+            p1 = np.exp(-(m_au * vel_norm_au**2) / (2 * beta))
+            return N * p1 * vel_norm_au**2
+        return PDF
 
-    def _energy_distribution(T_K, E_au):
+    def _energy_distribution():
         '''Returns the probability density of a given energy in a.u.
            at a given temperature in K'''
-        beta = constants.k_B_au * T_K
+        _c = pow(1 / beta, 3.0/2.0)
 
-        N = 2 * np.sqrt(E_au / np.pi) * pow(1 / beta, 3.0/2.0)
-        p1 = np.exp(-E_au / beta)
-
-        return N * p1
+        def PDF(E_au):
+            N = 2 * np.sqrt(E_au / np.pi) * _c
+            p1 = np.exp(-E_au / beta)
+            return N * p1
+        return PDF
 
     _options = {
             'velocity': _velocity_distribution,
             'energy': _energy_distribution,
             }
 
-    def PDF(x):
-        return _options.get(option)(T_K, x, *args)
-
-    return PDF
+    return _options.get(option)(*args)
 
 
 def signal_filter(n_frames, filter_length=None, filter_type='welch'):
@@ -172,13 +173,10 @@ def time_correlation_function(*args,
                          % (len(_sh1), _sh1))
 
     def _corr(_val1, _val2):
-        _sig = np.array([scipy.signal.correlate(
-                                                v1,
-                                                v2,
-                                                mode='full',
-                                                method='fft',
-                                                )
-                         for v1, v2 in zip(_val1.T, _val2.T)]).T
+        # --- all dimensions at once (correlate = convolve with reversed,
+        #     conjugated second signal)
+        _sig = scipy.signal.fftconvolve(_val1, _val2[::-1].conj(),
+                                        mode='full', axes=0)
 
         if adjusted_signal_length is not None:
             _n_frame_diff = adjusted_signal_length - n_frames
@@ -32,6 +32,7 @@
 import numpy as np
 import warnings
 import copy
+from itertools import chain
 
 from CifFile import ReadCif as _ReadCif
 import fortranformat as ff
@@ -81,7 +82,6 @@ def _cpmd(frame, convert=1, n_lines=1, filetype='TRAJECTORY'):
     '''Kernel for processing cpmd frame.'''
 
     # --- generator needs one+ call next() to allow for StopIteration
-    data = []
     # --- frame never starts with blank line --> EOF
     #     (+treatment of blank lines at EOF)
     if (_first_line := next(frame).strip()) == '':
@@ -89,20 +89,21 @@ def _cpmd(frame, convert=1, n_lines=1, filetype='TRAJECTORY'):
                       config.ChirPyWarning,
                       stacklevel=2)
         raise StopIteration
-    data.append(_first_line.split())
 
-    for _l in frame:
-        _l = _l.strip().split()
-        data.append(_l)
+    # --- parse all lines of the frame at once (C parser)
+    try:
+        data = np.loadtxt(chain((_first_line,), frame), ndmin=2)
+    except ValueError:
+        raise ValueError('CPMD file broken or incomplete')
 
     if len(data) != n_lines:
         raise ValueError('CPMD file broken or incomplete')
 
     if 'GEOMETRY' in filetype:
-        _data = np.array(data).astype(float)
+        _data = data
 
     elif filetype in ['TRAJECTORY', 'MOMENTS', 'MOMENTS_PF']:
-        _data = np.array(data).astype(float)[:, 1:]
+        _data = data[:, 1:]
 
     else:
         raise ValueError('Unknown CPMD filetype %s' % filetype)
@@ -30,6 +30,7 @@
 
 
 from itertools import islice, zip_longest
+from collections import deque
 import warnings
 import numpy as np
 # import io
@@ -39,11 +40,27 @@ from tqdm import tqdm
 from .. import config
 
 
-def _gen(f):
-    '''Global generator for all formats'''
+def _gen(f, chunk_size=1 << 20):
+    '''Global generator for all formats.
+       Reads the file in chunks of chunk_size characters and yields the
+       filtered lines (with line ending).'''
     # byte stream:
     # return (line for line in f if b'NEW DATA' not in line)
-    return (line for line in f if 'NEW DATA' not in line and '#' not in line)
+    _rest = ''
+    while (_chunk := f.read(chunk_size)):
+        _text = _rest + _chunk
+        _lines = _text.split('\n')
+        # --- keep incomplete last line for next chunk
+        _rest = _lines.pop()
+        # --- filter lines only if chunk contains any marker
+        #     (cheap single-character test first)
+        if '#' in _text or 'NEW DATA' in _text:
+            yield from [_l + '\n' for _l in _lines
+                        if '#' not in _l and 'NEW DATA' not in _l]
+        else:
+            yield from [_l + '\n' for _l in _lines]
+    if _rest and '#' not in _rest and 'NEW DATA' not in _rest:
+        yield _rest
 
 
 # def _bopen(*args, **kwargs):
@@ -66,7 +83,7 @@ def _open(*args, **kwargs):
     if kwargs.get('bz2') or args[0].split('.')[-1] == 'bz2':
         return _bz2.open(args[0], 'rt')
     else:
-        return open(*args)
+        return open(*args, buffering=1 << 20)
 
 
 def _get(_it, kernel, **kwargs):
@@ -86,6 +103,12 @@ def _get(_it, kernel, **kwargs):
 
     _sk = kwargs.pop("skip", [])
 
+    def _consume(n):
+        '''Advance _it by n lines at C speed'''
+        _last = deque(enumerate(islice(_it, n), 1), maxlen=1)
+        if not _last or _last[0][0] < n:
+            raise StopIteration()
+
     class _line_iterator():
         '''self._r ... the frame that will be returned next (!)'''
         def __init__(self):
@@ -94,8 +117,11 @@ def _get(_it, kernel, **kwargs):
             self._r = 0
             self._skip = _sk
             self._offset = 0
+            if not _sk and r0 > 0:
+                _consume(r0 * n_lines)
+                self._r = r0
             while self._r < r0:
-                [next(_it) for _ik in range(n_lines)]
+                _consume(n_lines)
                 if self._r + self._offset in _sk:
                     self._skip.remove(self._r + self._offset)
                     self._offset += 1
@@ -107,7 +133,7 @@ def _get(_it, kernel, **kwargs):
 
         def __next__(self):
             while (self._r - r0) % _ir != 0 or self._r + self._offset in _sk:
-                [next(_it) for _ik in range(n_lines)]
+                _consume(n_lines)
                 if self._r + self._offset in _sk:
                     self._skip.remove(self._r + self._offset)
                     self._offset += 1
@@ -135,6 +161,7 @@ def _get(_it, kernel, **kwargs):
             break
 
 
+@config.config_dependent
 def _reader(FN, n_lines, kernel,
             convert=1,
             verbose=config.__verbose__,
@@ -169,11 +196,10 @@ def _container(reader_a, fn_a, args_a=(), kwargs_a=()):
        reader_a/fn_a/args_a/kwargs_a are iterables
        of reader functions and their filenames + arguments.'''
     try:
-        for _frame in zip_longest(*map(
-             lambda x: x[0](x[1], *x[2], **x[3]),
-             # i.e.: reader(fn,   *args, **kwargs)
-             zip_longest(reader_a, fn_a, args_a, kwargs_a, fillvalue={})
-             )):
+        _gens = [_read(_fn, *_args, **_kwargs)
+                 for _read, _fn, _args, _kwargs in zip_longest(
+                     reader_a, fn_a, args_a, kwargs_a, fillvalue={})]
+        for _frame in zip_longest(*_gens):
             # -- frame = (out0, out1, out2, ...)
             yield list(zip_longest(*_frame))
     except TypeError:
@@ -70,7 +70,12 @@ def tracked_update(dict1, dict2, msg='in dict1!'):
 def equal(a, b):
     '''return all-equal regardless of type'''
     if isinstance(a, _np.ndarray) or isinstance(b, _np.ndarray):
-        return _np.all(a == b)
+        # --- fast paths: scalars and equal shapes (no bool array)
+        if _np.ndim(a) == 0 and _np.ndim(b) == 0:
+            return bool(a == b)
+        if _np.shape(a) == _np.shape(b):
+            return _np.array_equal(a, b)
+        return bool(_np.all(a == b))
     else:
         return a == b
 
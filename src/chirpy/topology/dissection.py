@@ -31,6 +31,7 @@
 
 import numpy as np
 import copy
+from collections import deque
 
 from ..topology.mapping import vector_pbc, wrap_pbc, cell_vec, \
     detect_lattice, neighbour_matrix, cell_l_deg
@@ -67,15 +68,20 @@ def _make_batches(MIN, MAX, nb, ov=None):
     return _batches
 
 
-def define_molecules(pos_aa, symbols, cell_aa_deg=None, neigh_cutoff_aa=24.):
+def define_molecules(pos_aa, symbols, cell_aa_deg=None, neigh_cutoff_aa=24.,
+                     dtype=np.float32):
     '''Distance analysis in batches to create a neighbour list which is
        further evaluated to obtain clusters/molecules.
        Expects positions in angstrom of shape (n_atoms, three).
        It returns a list with assignments.
        neigh_cutoff_aa ... max distance to look for neighbours
+       dtype ... floating point precision of the distance analysis
+                 (single precision is sufficient for bond criteria)
        '''
 
-    _p = pos_aa
+    _p = np.asarray(pos_aa, dtype=dtype)
+    if cell_aa_deg is not None:
+        cell_aa_deg = np.asarray(cell_aa_deg, dtype=dtype)
     if len(_p.shape) != 2:
         raise TypeError('Positions not in shape (n_atoms, three)!')
 
@@ -216,21 +222,16 @@ def assign_molecule(molecule, n_mol, n_atoms, neigh_list, atom, atom_count):
     atom … current line in reading neighbour map
     atom_count … starts with n_atoms until zero
     '''
+    # --- iterative breadth-first search (no recursion limit)
     molecule[atom] = n_mol
     atom_count -= 1
-    for _i in neigh_list[atom]:
-        if molecule[_i] == 0:
-            molecule, atom_count = assign_molecule(
-                molecule,
-                n_mol,
-                n_atoms,
-                neigh_list,
-                _i,
-                atom_count
-                )
-            # print(atom_count)
-        if atom_count == 0:
-            break
+    _queue = deque([atom])
+    while _queue and atom_count > 0:
+        for _i in neigh_list[_queue.popleft()]:
+            if molecule[_i] == 0:
+                molecule[_i] = n_mol
+                atom_count -= 1
+                _queue.append(_i)
     return molecule, atom_count
 
 
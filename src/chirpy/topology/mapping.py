@@ -30,14 +30,14 @@
 
 
 import numpy as np
-import copy
 import warnings as _warnings
 from itertools import product
+from scipy.spatial import cKDTree
+from functools import lru_cache
 
 from .. import constants
 from ..mathematics.algebra import change_euclidean_basis as ceb
-from ..mathematics.algebra import kabsch_algorithm, rotate_vector, angle, \
-        signed_angle, vector, dihedral
+from ..mathematics.algebra import angle, signed_angle, vector, dihedral
 
 from ..snippets import _unpack_tuple
 from ..config import ChirPyWarning as _ChirPyWarning
@@ -51,40 +51,48 @@ def dist_crit_aa(symbols):
     '''Get distance criteria matrix for bond between atoms (in angstrom)
        http://www.ks.uiuc.edu/Research/vmd/vmd-1.9.1/ug/node26.html
        '''
-    natoms = len(symbols)
-    crit_aa = np.zeros((natoms, natoms))
-    _r = np.array(constants.symbols_to_rvdw(symbols)) / 100.0
+    _r = _rvdw_aa(tuple(symbols))
     crit_aa = (_r[:, None] + _r[None, :])
     crit_aa *= 0.6
     return crit_aa
 
 
+# --- cache the O(N) radii only; the matrix is built per call
+@lru_cache(maxsize=32)
+def _rvdw_aa(symbols):
+    '''cached van der Waals radii of symbols (in angstrom, read-only)'''
+    _r = np.array(constants.symbols_to_rvdw(symbols)) / 100.0
+    _r.flags.writeable = False
+    return _r
+
+
 def dec(prop, indices, n_ind=None, axis=0):
     """decompose prop according to indices
        n_ind: interpret numerical entries of indices and return empty arrays
        for missing indices"""
+    _indices = np.array(indices)
     if n_ind is not None:
-        iterator = range(n_ind)
+        _keys = np.arange(n_ind)
     else:
-        iterator = set(indices)
+        _keys = np.unique(_indices)
+
+    # --- group positions by index with one (stable) sort
+    _order = np.argsort(_indices, kind='stable')
+    _sorted = _indices[_order]
+    _groups = [_order[_lo:_hi] for _lo, _hi in zip(
+                    np.searchsorted(_sorted, _keys, side='left'),
+                    np.searchsorted(_sorted, _keys, side='right'))]
+
     if isinstance(prop, (tuple, list)):
         assert axis == 0, 'cannot process axis != 0 for tuple or list'
         assert len(prop) == len(indices), \
             'lenght of index array does not match atom data'
-        return [
-            type(prop)([
-                prop[k] for k, j_mol in enumerate(indices) if j_mol == i_mol
-                ]) for i_mol in iterator
-            ]
+        return [type(prop)([prop[k] for k in _g]) for _g in _groups]
     else:
-        _indices = np.array(indices)
         assert prop.shape[axis] == len(indices), \
             'length of index array does not match data: ' + \
             f'{len(_indices)}, {prop.shape}'
-        return [
-                np.take(prop, np.where(_indices == i_mol)[0], axis=axis)
-                for i_mol in iterator
-            ]
+        return [np.take(prop, _g, axis=axis) for _g in _groups]
 
 
 def cowt(pos, wt, axis=-2, mask=None, subset=slice(None)):
@@ -99,10 +107,22 @@ def cowt(pos, wt, axis=-2, mask=None, subset=slice(None)):
         _wt = np.array(wt)
 
     if mask is not None:
-        _dwt = dec(_wt[subset], mask)
-        _dpos = dec(_pos[subset], mask)
-        return np.moveaxis(np.array([cowt(_p, _w, axis=0)
-                                     for _w, _p in zip(_dwt, _dpos)]),
+        # --- sort units into contiguous blocks and reduce per block
+        _mask = np.asarray(mask)
+        _w = _wt[subset]
+        _p = _pos[subset]
+        # --- units already contiguous (usual for mol_map): no permutation
+        if np.all(_mask[1:] >= _mask[:-1]):
+            _sorted = _mask
+        else:
+            _order = np.argsort(_mask, kind='stable')
+            _sorted = _mask[_order]
+            _w = _w[_order]
+            _p = _p[_order]
+        _offsets = np.flatnonzero(np.r_[True, _sorted[1:] != _sorted[:-1]])
+        _slc = (slice(None),) + (len(_p.shape)-1) * (None,)
+        return np.moveaxis(np.add.reduceat(_p * _w[_slc], _offsets, axis=0)
+                           / np.add.reduceat(_w, _offsets)[_slc],
                            0, axis)
 
     _slc = (subset,) + (len(_pos.shape)-1) * (None,)
@@ -141,9 +161,15 @@ def cell_vec(cell, n_fields=3, priority=(0, 1, 2)):
        (e.g. for monoclinic cells: beta is the angle > 90°; CPMD wants alpha
        to be >90° but this is wrong and CELL VECTORS should be used instead)
        '''
-    if isinstance(cell, list):
-        cell = np.array(cell)
+    cell = np.asarray(cell)
+    return _cell_vec_kernel(cell.tobytes(), cell.dtype.str, n_fields,
+                            tuple(priority)).copy()
+
 
+@lru_cache(maxsize=64)
+def _cell_vec_kernel(cell_bytes, dtype, n_fields, priority):
+    '''cached kernel of cell_vec (do not modify the returned array)'''
+    cell = np.frombuffer(cell_bytes, dtype=dtype)
     abc, albega = cell[:3], cell[3:] * np.pi / 180.
     cell_vec = np.zeros((3, n_fields))
     v0, v1, v2 = priority
@@ -154,6 +180,7 @@ def cell_vec(cell, n_fields=3, priority=(0, 1, 2)):
         * np.sin(albega[(3 - v1 - v2)])
     cell_vec[v2, v0] = abc[v2] * np.cos(albega[(3 - v0 - v2)])
     cell_vec[v2, v1] = abc[v2] * np.cos(albega[(3 - v1 - v2)])
+    cell_vec.flags.writeable = False
 
     return cell_vec
 
@@ -170,6 +197,14 @@ def detect_lattice(cell, priority=(0, 1, 2)):
        '''
     if cell is None:
         return None
+    cell = np.asarray(cell)
+    return _detect_lattice(cell.tobytes(), cell.dtype.str)
+
+
+@lru_cache(maxsize=64)
+def _detect_lattice(cell_bytes, dtype):
+    '''cached kernel of detect_lattice'''
+    cell = np.frombuffer(cell_bytes, dtype=dtype)
     if np.any(cell == 0.):
         return None
 
@@ -191,7 +226,7 @@ def detect_lattice(cell, priority=(0, 1, 2)):
         elif not np.any(_a):
             return 'monoclinic'
         else:
-            _warnings.warn("Unusual lattice!", _ChirPyWarning, stacklevel=2)
+            _warnings.warn("Unusual lattice!", _ChirPyWarning, stacklevel=3)
             return 'triclinic'
 
     elif np.all(abc == abc[0]) and np.all(albega == albega[0]):
@@ -207,17 +242,20 @@ def wrap_pbc(positions, cell):
 
     if (lattice := detect_lattice(cell)) not in [None, 'void']:
         if lattice in ['cubic', 'orthorhombic', 'tetragonal']:
-            # --- fast
-            return positions - np.floor(positions/cell[:3]) * cell[:3]
+            # --- fast (single temporary, updated in place)
+            _abc = np.asarray(cell[:3])
+            _s = positions / _abc
+            np.floor(_s, out=_s)
+            _s *= _abc
+            return np.subtract(positions, _s, out=_s)
 
         else:
-            # --- more expensive (ToDo: optimise tensordot, ceb; has np.cross)
-            _cell_vec = cell_vec(cell)  # checked: inexpensive
-            return positions - np.tensordot(
-                                        np.floor(ceb(positions, _cell_vec)),
-                                        _cell_vec,
-                                        axes=1
-                                        )
+            # --- more expensive (cached cell vectors and dual basis)
+            _cell_vec, _inv = _cell_vec_inv(
+                                np.asarray(cell, dtype=float).tobytes())
+            _c = positions @ _inv
+            _s = np.floor(_c, out=_c) @ _cell_vec
+            return np.subtract(positions, _s, out=_s)
     else:
         return positions
 
@@ -294,8 +332,12 @@ def unwrap_pbc(positions, reference=None, cell=None, axis=0, mode='naive'):
         if reference is None:
             reference = np.take(positions, [0], axis=axis)
         _d = np.diff(positions, axis=axis, prepend=reference)
-        _d2 = _d - _pbc_shift(_d, cell, mode=mode)
-        return np.cumsum(_d2, axis=axis) + reference
+        # --- reuse the (fresh) shift array for all further steps
+        _d2 = _pbc_shift(_d, cell, mode=mode)
+        np.subtract(_d, _d2, out=_d2)
+        np.cumsum(_d2, axis=axis, out=_d2)
+        _d2 += reference
+        return _d2
     else:
         return positions
 
@@ -305,6 +347,21 @@ def distance_pbc(*args, **kwargs):
     return vector_pbc(*args, **kwargs)
 
 
+@lru_cache(maxsize=32)
+def _cell_vec_inv(cell_bytes, angular=False):
+    '''Cell vectors and their inverse (i.e. the transposed dual basis)
+       for the cell given as raw bytes. Cached, read-only.
+       angular=True for the basis of angular magnitudes (p × p or p × v)'''
+    _cell_vec = cell_vec(np.frombuffer(cell_bytes))
+    if angular:
+        _cell_vec = np.linalg.det(_cell_vec) * np.linalg.inv(_cell_vec).T
+    _cell_vec = np.ascontiguousarray(_cell_vec)
+    _inv = np.ascontiguousarray(ceb(np.eye(3), _cell_vec))
+    _cell_vec.flags.writeable = False
+    _inv.flags.writeable = False
+    return _cell_vec, _inv
+
+
 def _pbc_shift(_d, cell, mode='naive', priority='auto'):
     '''_d in aa of shape ...
        cell: [ a b c al be ga ]
@@ -330,7 +387,8 @@ def _pbc_shift(_d, cell, mode='naive', priority='auto'):
         return np.zeros_like(_d)
 
     if not all([_a == 90.0 for _a in cell[3:]]):
-        _cell_vec = cell_vec(cell)
+        _cell_vec, _inv = _cell_vec_inv(
+                                np.asarray(cell, dtype=float).tobytes())
         match mode:
             case 'priority':
                 if priority == 'auto':
@@ -344,7 +402,7 @@ def _pbc_shift(_d, cell, mode='naive', priority='auto'):
                 else:
                     _order = priority
 
-                _d_pbc = copy.deepcopy(_d)
+                _d_pbc = _d.copy()
                 for _i in _order:
                     _d_pbc -= \
                             np.around(_d_pbc/_cell_vec[_i, _i])[..., _i, None]\
@@ -354,21 +412,25 @@ def _pbc_shift(_d, cell, mode='naive', priority='auto'):
             case 'accurate':
                 _lattice_combinations = \
                     list(product([0, 1, -1], repeat=3)) @ _cell_vec
+                # --- argmin |d - L|² = argmin (|L|² - 2 d·L)
                 _I = np.argmin(
-                        np.linalg.norm(
-                            [_d - _L for _L in _lattice_combinations],
-                            axis=-1
-                            ),
-                        axis=0
+                        (_lattice_combinations**2).sum(-1)
+                        - 2 * _d @ _lattice_combinations.T,
+                        axis=-1
                         )
                 return np.take(_lattice_combinations, _I, axis=0)
 
             case 'naive' | _:
-                _c = ceb(_d, _cell_vec)
-                return np.tensordot(np.around(_c), _cell_vec, axes=1)
+                _c = _d @ _inv
+                return np.around(_c, out=_c) @ _cell_vec
 
     else:
-        return np.around(_d/cell[:3]) * cell[:3]
+        # --- one temporary, rounded and scaled in place
+        _abc = np.asarray(cell[:3])
+        _s = _d / _abc
+        np.around(_s, out=_s)
+        _s *= _abc
+        return _s
 
 
 # --- ToDo: rename the next two methods
@@ -377,10 +439,9 @@ def get_cell_coordinates(positions, cell, angular=False):
        angular=True for transformation of angular magnitudes
        of the form p × p or p × v
        '''
-    _cell_vec = cell_vec(cell)
-    if angular:
-        _cell_vec = np.linalg.det(_cell_vec) * np.linalg.inv(_cell_vec).T
-    return ceb(positions, _cell_vec)
+    _cell_vec, _inv = _cell_vec_inv(np.asarray(cell, dtype=float).tobytes(),
+                                    angular=angular)
+    return np.ascontiguousarray(positions) @ _inv
 
 
 def get_cartesian_coordinates(positions, cell, angular=False):
@@ -388,36 +449,35 @@ def get_cartesian_coordinates(positions, cell, angular=False):
        angular=True for transformation of angular magnitudes
        of the form p × p or p × v
        '''
-    _cell_vec = cell_vec(cell)
-    if angular:
-        _cell_vec = np.linalg.det(_cell_vec) * np.linalg.inv(_cell_vec).T
-
-    return positions @ _cell_vec
-    # match len(positions.shape):
-    #     case 1:
-    #         return np.einsum('i, ij -> j',
-    #                          positions,
-    #                          _cell_vec
-    #                          )
-    #     case 2:
-    #         return np.einsum('ni, ij -> nj',
-    #                          positions,
-    #                          _cell_vec
-    #                          )
-    #     case 3:
-    #         return np.einsum('kni, ij -> knj',
-    #                          positions,
-    #                          _cell_vec
-    #                          )
+    _cell_vec, _inv = _cell_vec_inv(np.asarray(cell, dtype=float).tobytes(),
+                                    angular=angular)
+    return np.ascontiguousarray(positions) @ _cell_vec
+
+
+def _squared_distance_matrix(p0, p1):
+    '''|p1 - p0|² of all pairs without (n, m, three) intermediate
+       (one matrix product). Exact zeros on the diagonal if p1 is p0.'''
+    # --- centre coordinates to limit cancellation errors
+    _c = p0.mean(axis=0)
+    _p0, _p1 = p0 - _c, p1 - _c
+    _n0, _n1 = (_p0 * _p0).sum(-1), (_p1 * _p1).sum(-1)
+    _sq = _n0[:, None] + _n1[None, :] - 2 * _p0 @ _p1.T
+    _sq[_sq < 8 * np.finfo(_sq.dtype).eps *
+        max(_n0.max(), _n1.max())] = 0.0
+    if p1 is p0:
+        np.fill_diagonal(_sq, 0.0)
+    return _sq
 
 
 def distance_matrix(p0, p1=None, cell=None, cartesian=False,
-                    return_pbc_bool=False, **kwargs):
+                    return_pbc_bool=False, squared=False, **kwargs):
     '''Expects one or two args of shape (n_atoms, three) ... (FRAME).
        Order: p0, p1 ==> d = p1 - p0
 
        Supports periodic boundaries (give cell as [x, y, z, al, be, ga];
                                      angles in degrees).
+       squared ... return squared distances (skips sqrt; ignored if
+                   cartesian)
        '''
     # ToDo: the following lines explode memory for many atoms
     #   ==> do coarse mapping beforehand
@@ -434,6 +494,9 @@ def distance_matrix(p0, p1=None, cell=None, cartesian=False,
         raise MemoryError('Too many atoms for molecular recognition'
                           '(>10000 atom support in a future version)!'
                           )
+    if squared and not cartesian and not return_pbc_bool and cell is None:
+        return _squared_distance_matrix(p0, p1)
+
     if return_pbc_bool:
         dist_array, B = vector_pbc(p0[:, None], p1[None, :], cell=cell,
                                    return_pbc_bool=return_pbc_bool, **kwargs)
@@ -442,6 +505,8 @@ def distance_matrix(p0, p1=None, cell=None, cartesian=False,
 
     if cartesian:
         _return = (dist_array,)
+    elif squared:
+        _return = (np.einsum('...i, ...i', dist_array, dist_array),)
     else:
         _return = (np.linalg.norm(dist_array, axis=-1),)
 
@@ -458,20 +523,26 @@ def neighbour_matrix(pos_aa, symbols, cell_aa_deg=None,
        Expects positions in angstrom of shape (n_atoms, three).
        '''
     symbols = np.array(symbols)
+    # --- compare squared distances unless distances are returned
+    _squared = not (cartesian or return_distances)
     if return_pbc_bool:
         dist_array, B = distance_matrix(pos_aa, cell=cell_aa_deg,
                                         cartesian=cartesian,
                                         return_pbc_bool=return_pbc_bool,
+                                        squared=_squared,
                                         mode='naive')
     else:
         dist_array = distance_matrix(pos_aa, cell=cell_aa_deg,
                                      cartesian=cartesian,
+                                     squared=_squared,
                                      mode='naive')
     # --- working copy
     if cartesian:
         _dist_array = np.linalg.norm(dist_array, axis=-1)
+    elif _squared:
+        _dist_array = dist_array
     else:
-        _dist_array = copy.deepcopy(dist_array)
+        _dist_array = dist_array.copy()
     _dist_array[_dist_array == 0.0] = 'Inf'
 
     # --- ToDo: Do valency check instead
@@ -484,6 +555,8 @@ def neighbour_matrix(pos_aa, symbols, cell_aa_deg=None,
     _dist_array[_hind, _hmin] = 0.0
     _dist_array[_hmin, _hind] = 0.0
     crit_aa = dist_crit_aa(symbols)
+    if _squared:
+        crit_aa = crit_aa**2
 
     _return = (_dist_array <= crit_aa,)
     if return_distances:
@@ -515,9 +588,15 @@ def close_neighbours(p0, cell=None, crit=None, symbols=None):
         else:
             crit = dist_crit_aa(symbols) / 2.0
 
-    return [(_i, [(_j, _dM[_i, _j]) for _j in np.argwhere(_idM).flatten()])
-            for _i, _idM in enumerate(np.triu(_dM <= crit, k=1))
-            if np.any(_idM)]
+    # --- close pairs of the upper triangle (row-major order)
+    _i, _j = np.nonzero(_dM <= crit)
+    _upper = _i < _j
+    _i, _j = _i[_upper], _j[_upper]
+    _d = _dM[_i, _j]
+    _rows, _start = np.unique(_i, return_index=True)
+    _end = np.append(_start[1:], len(_i))
+    return [(int(_r), list(zip(_j[_s:_e], _d[_s:_e])))
+            for _r, _s, _e in zip(_rows, _start, _end)]
 
 
 def connectivity(pos_aa, symbols, cell_aa_deg=None):
@@ -528,7 +607,9 @@ def connectivity(pos_aa, symbols, cell_aa_deg=None):
                      (optional)
     '''
     neighs = neighbour_matrix(pos_aa, symbols, cell_aa_deg=cell_aa_deg)
-    return [np.argwhere(_n).ravel() for _n in neighs]
+    # --- one scan of the matrix; nonzero returns pairs in row-major order
+    _rows, _cols = np.nonzero(neighs)
+    return np.split(_cols, np.searchsorted(_rows, np.arange(1, len(neighs))))
 
 
 def join_molecules(pos_aa, mol_map, cell_aa_deg,
@@ -538,6 +619,7 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
                    connectivity=None,
                    fast_forward=True,
                    reference=None,
+                   executor=None,
                    ):
     '''pos_aa (in angstrom) with shape ([n_frames,] n_atoms, three)
     Has still problems with cell-spanning molecules
@@ -550,6 +632,13 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
     reference ... if algorithm is set to 'reference', use reference positions
                    (1, n_atoms, three) of already joined molecules.
                    Similar to fast_forward.
+    connectivity ... precomputed neighbour matrix (n_atoms, n_atoms) of the
+                     system (see neighbour_matrix). Skips the recalculation
+                     of covalent neighbours (immutable topologies).
+    executor ... optional concurrent.futures executor (e.g. a
+                 ThreadPoolExecutor created once by the caller) to join
+                 molecules concurrently; serial by default. Pays off only
+                 for large molecules.
     '''
     if 0 not in mol_map:
         raise TypeError('Given mol_map not an enumeration of indices!' %
@@ -568,16 +657,19 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
             raise ValueError('connectivity requires symbols argument')
         _sym = np.ones((n_atoms))
 
-    _pos_aa = dec(pos_aa, mol_map)
-    mol_com_aa = []
-    # --- NB: looping over molecules to reduce memory overhead
-    # for _i, (_w, _s, _p) in tqdm.tqdm(
-    #                         enumerate(zip(w, _sym, _pos_aa)),
-    #                         disable=not config.__verbose__,
-    #                         desc='join molecules',
-    #                         total=len(_sym),
-    #                         ):
-    for _i, (_w, _s, _p) in enumerate(zip(w, _sym, _pos_aa)):
+    # --- molecule-sorted contiguous block of positions (one view per
+    #     molecule, same order as dec); scattered back once at the end
+    _mol_map = np.array(mol_map)
+    _order = np.argsort(_mol_map, kind='stable')
+    _sorted_pos_aa = pos_aa[_order]
+    _offsets = np.searchsorted(_mol_map[_order], np.unique(_mol_map))
+    _offsets = np.append(_offsets, n_atoms)
+    _pos_aa = [_sorted_pos_aa[_s:_e]
+               for _s, _e in zip(_offsets[:-1], _offsets[1:])]
+
+    # --- NB: processing molecules one by one to reduce memory overhead
+    def _join_molecule(_i, _w, _s, _p):
+        '''join molecule _i in place (_p) and return its centre'''
         if len(_p.shape) == 3:
             _frames = True
             n_frames = _shape[1]
@@ -587,20 +679,26 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
             _p_ref = _p
 
         if algorithm == 'connectivity':
-            # --- ToDo: do not always recalculate D and N (store it in object)
-            N, D, B = neighbour_matrix(_p_ref, _s,
-                                       cell_aa_deg=cell_aa_deg,
-                                       return_distances=True,
+            if connectivity is None:
+                N, D, B = neighbour_matrix(_p_ref, _s,
+                                           cell_aa_deg=cell_aa_deg,
+                                           return_distances=True,
+                                           cartesian=True,
+                                           return_pbc_bool=True)
+            else:
+                # --- reuse given topology (copy: links may be added below)
+                _idx = _order[_offsets[_i]:_offsets[_i+1]]
+                N = np.asarray(connectivity, dtype=bool)[np.ix_(_idx, _idx)]
+                D, B = distance_matrix(_p_ref, cell=cell_aa_deg,
                                        cartesian=True,
-                                       return_pbc_bool=True)
+                                       return_pbc_bool=True,
+                                       mode='naive')
             if not _frames and B.all():  # --- molecule not broken
                 # --- ensure mol cowt lies within cell
                 c_aa = cowt(_p, _w, axis=0)
                 _delta = wrap_pbc(c_aa, cell_aa_deg) - c_aa
-                mol_com_aa.append(c_aa + _delta)
-                ind = np.array(mol_map) == _i
-                pos_aa[ind] = _p + _delta[None]
-                continue
+                _p += _delta[None]
+                return c_aa + _delta
 
             _m_n_atoms = len(_p)
             if _frames and not fast_forward:
@@ -611,7 +709,7 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
             # ----- closest to its neighbours:
             # _r = np.argmin(np.linalg.norm(D, axis=(1, 2)))
             # ----- w/ weighting:
-            _r = np.argmin(np.linalg.norm(D, axis=(1, 2)) / _w)
+            _r = np.argmin(np.sqrt(np.einsum('ijk, ijk -> i', D, D)) / _w)
             # ----- closests to cell center (for tetragonal cells):
             # _r = np.argmin(np.linalg.norm(_p_ref - cell_aa_deg[None, :3]/2,
             #                               axis=-1) / _w)
@@ -628,11 +726,10 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
                         #                "molecular map.", _ChirPyWarning,
                         #                stacklevel=2)
                         # --- create additional link to nearest atom
-                        not_n0 = (np.ones(_m_n_atoms) - n0).astype(bool)
-                        _r = np.argmin(
-                                np.linalg.norm(D[n0][:, not_n0],
-                                               axis=-1)
-                                )
+                        not_n0 = ~n0
+                        # --- argmin of squared distances (no sqrt needed)
+                        _D = D[np.ix_(n0, not_n0)]
+                        _r = np.argmin(np.einsum('ijk, ijk -> ij', _D, _D))
                         _ind = np.unravel_index(_r, (_S_n0, _m_n_atoms-_S_n0))
                         N[np.argwhere(n0)[_ind[0]],
                           np.argwhere(not_n0)[_ind[1]]] = 1
@@ -645,23 +742,20 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
                     # --- assuming constant connectivity through N
                     # --- ToDo: if N is constant, fast_forward is always exact
                     #           ---> implement variable N
-                    _D = np.moveaxis(np.array(
-                        [distance_matrix(_p[n0, _ii], _p[n, _ii],
-                                         cell=cell_aa_deg, cartesian=True)
-                         # for _ii in tqdm.tqdm(
-                         #              range(n_frames),
-                         #              disable=not config.__verbose__,
-                         #              desc=f'mol {_i} (iteration {_n_iter})',
-                         #              )]), 0, -2)
-                         for _ii in range(n_frames)]), 0, -2)
+                    # --- all frames at once: (|n0|, |n|, n_frames, three)
+                    _D = vector_pbc(_p[n0][:, None], _p[n][None],
+                                    cell=cell_aa_deg)
                     _D = _D.reshape((n0.sum(), n.sum(), -1))
                     _NP = np.einsum('ijk, ij -> jk', P[n0, None]+_D,
                                     N[n0][:, n])
                     P[n] = _NP / m[n, None]
                 else:
-                    _NP = np.einsum('ijk, ij -> jk', P[n0, None]+D[n0], N[n0])
-                    P[n] = _NP[n] / m[n, None]
-                n_1 = copy.deepcopy(n0)
+                    # --- sum_i N_ij (P_i + D_ij) over frontier pairs only
+                    _N = N[np.ix_(n0, n)]
+                    _NP = _N.T @ P[n0] + np.einsum('ij, ijk -> jk', _N,
+                                                   D[np.ix_(n0, n)])
+                    P[n] = _NP / m[n, None]
+                n_1 = n0.copy()
                 n0 |= n
                 _n_iter += 1
                 if _n_iter >= _m_n_atoms:
@@ -715,9 +809,8 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
         #     (ToDo: choose _r such that this line is no required)
         #       ---> actually possible? use B?
         _delta = wrap_pbc(c_aa, cell_aa_deg) - c_aa
-        mol_com_aa.append(c_aa + _delta)
-        ind = np.array(mol_map) == _i
-        pos_aa[ind] = P + _delta[None]
+        _p[:] = P + _delta[None]
+        return c_aa + _delta
 
         # --- legacy code (2)
         # --- complete mols
@@ -736,6 +829,15 @@ def join_molecules(pos_aa, mol_map, cell_aa_deg,
         #     ind = np.array(mol_map) == _i
         #     pos_aa[ind] = _pos_aa[_i] + _com[None, :]
 
+    # --- molecules are independent (disjoint slices of _sorted_pos_aa)
+    _args = (range(len(_pos_aa)), w, _sym, _pos_aa)
+    if executor is not None:
+        mol_com_aa = list(executor.map(_join_molecule, *_args))
+    else:
+        mol_com_aa = list(map(_join_molecule, *_args))
+
+    pos_aa[_order] = _sorted_pos_aa
+
     return np.moveaxis(pos_aa, 0, -2), np.moveaxis(np.array(mol_com_aa), 0, -2)
 
 
@@ -762,10 +864,10 @@ def align_atoms(positions, weights, reference=None, subset=slice(None),
 
     # --- no frame dimension: set it to one
     if len(positions) == 2:
-        pos_mob = np.array([copy.deepcopy(positions)])
+        pos_mob = np.array([positions])
 
     else:
-        pos_mob = copy.deepcopy(positions)
+        pos_mob = np.array(positions)
 
     if not hasattr(weights, '__len__'):
         w = np.ones(pos_mob.shape[-2]) * weights
@@ -776,7 +878,7 @@ def align_atoms(positions, weights, reference=None, subset=slice(None),
     # --- default reference: frame 0
     if reference is None:
         reference = positions[0][_sub]
-    _s_pos_ref = copy.deepcopy(reference)
+    _s_pos_ref = np.array(reference)
     _s_pos_mob = pos_mob[:, _sub]
 
     # --- get com of data sets
@@ -792,14 +894,19 @@ def align_atoms(positions, weights, reference=None, subset=slice(None),
     _s_pos_mob = pos_mob[:, _sub]
     del _i_s_pos_ref, _i_pos_mob
 
-    Rmatrix = ()
-    for frame, P in enumerate(_s_pos_mob):
-        U = kabsch_algorithm(P * w[_sub, None], _s_pos_ref * w[_sub, None])
-        pos_mob[frame] = rotate_vector(pos_mob[frame], U)
-        if _data is not None:
-            for _d in _data:
-                _d[frame] = rotate_vector(_d[frame], U)
-        Rmatrix += (U,)
+    # --- Kabsch algorithm for all frames at once (cf. kabsch_algorithm)
+    C = np.swapaxes(_s_pos_ref * w[_sub, None], -1, -2) \
+        @ (_s_pos_mob * w[_sub, None])
+    V, S, W = np.linalg.svd(C)
+    _flip = np.linalg.det(V) * np.linalg.det(W) < 0.0
+    V[_flip, :, -1] *= -1
+    Rmatrix = V @ W
+
+    # --- rotate (cf. rotate_vector)
+    pos_mob = np.einsum('fji, fmi -> fmj', Rmatrix, pos_mob)
+    if _data is not None:
+        for _d in _data:
+            _d[:] = np.einsum('fji, fmi -> fmj', Rmatrix, _d)
 
     # --- define return shift
     com_return = com_ref
@@ -811,33 +918,74 @@ def align_atoms(positions, weights, reference=None, subset=slice(None),
     if _data is not None:
         _return += (_data,)
     if return_Rmatrix:
-        _return += (np.array(Rmatrix),)
+        _return += (Rmatrix,)
 
     return _unpack_tuple(_return)
 
 
-def find_methyl_groups(pos, symbols, hetatm=False, cell_aa_deg=None):
+def _neighbour_pairs(p0, p1, r, cell=None):
+    '''Index pairs (i, j) of p0 and p1 within distance r and their
+       distances. Local neighbour search in a KD tree (periodic box for
+       orthorhombic cells); other cells use the distance matrix.'''
+    lattice = detect_lattice(cell)
+    if lattice in [None, 'void', 'cubic', 'orthorhombic', 'tetragonal']:
+        _box = None
+        if lattice not in [None, 'void']:
+            _box = np.asarray(cell[:3], dtype=float)
+
+            def _wrap(_p):
+                _p = np.mod(_p, _box)
+                return np.where(_p >= _box, _p - _box, _p)
+            p0, p1 = _wrap(p0), _wrap(p1)
+
+        _pairs = cKDTree(p0, boxsize=_box).sparse_distance_matrix(
+                            cKDTree(p1, boxsize=_box), r,
+                            output_type='ndarray')
+        return _pairs['i'], _pairs['j'], _pairs['v']
+
+    _dist = distance_matrix(p0, p1, cell=cell)
+    _i, _j = np.nonzero(_dist <= r)
+    return _i, _j, _dist[_i, _j]
+
+
+def find_methyl_groups(pos, symbols, hetatm=False, cell_aa_deg=None,
+                       verbose=True):
     '''pos of shape (n_atoms, n_fields) (FRAME)
-       Outformat is C H H H'''
+       Returns atom indices of shape (n_methyls, 4) as C H H H
+       (printed with format_methyl_groups if verbose).'''
 
-    dist_array = distance_matrix(pos, cell=cell_aa_deg)
-    n_atoms = len(symbols)
     symbols = np.array(symbols)
-
-    indh = symbols == 'H'
+    indh = np.flatnonzero(symbols == 'H')
     if hetatm:
-        ind = symbols != 'H'
+        ind = np.flatnonzero(symbols != 'H')
     else:
-        ind = symbols == 'C'
-    ids = np.arange(n_atoms) + 1
-    out = [[ids[i], [ids[j] for j in range(n_atoms)
-            if dist_array[i, j] < dist_crit_aa(symbols)[i, j] and indh[j]]]
-           for i in range(n_atoms) if ind[i]]
+        ind = np.flatnonzero(symbols == 'C')
+
+    methyls = np.zeros((0, 4), dtype=int)
+    if len(ind) > 0 and len(indh) > 0:
+        crit_aa = dist_crit_aa(symbols)[np.ix_(ind, indh)]
+        _i, _j, _dist = _neighbour_pairs(pos[ind], pos[indh], crit_aa.max(),
+                                         cell=cell_aa_deg)
+        _bound = _dist < crit_aa[_i, _j]
+        _i, _j = _i[_bound], _j[_bound]
+        _sort = np.lexsort((_j, _i))
+        _i, _j = _i[_sort], _j[_sort]
+        _methyl = np.isin(_i, np.flatnonzero(np.bincount(_i) == 3))
+
+        methyls = np.column_stack((ind[_i[_methyl][::3]],
+                                   indh[_j[_methyl]].reshape(-1, 3)))
+
+    if verbose:
+        print(format_methyl_groups(methyls))
+
+    return methyls
 
-    out = '\n'.join(['A%03d ' % i[0]+'A%03d A%03d A%03d' % tuple(i[1])
-                     for i in out if len(i[1]) == 3])
 
-    print(out)
+def format_methyl_groups(methyls):
+    '''Text listing of methyl groups (see find_methyl_groups) with
+       one-based atom ids: A001 A002 A003 A004'''
+    return '\n'.join(['A%03d A%03d A%03d A%03d' % tuple(_m)
+                      for _m in np.asarray(methyls) + 1])
 
 
 def isHB(*args, **kwargs):
@@ -872,33 +1020,51 @@ def ishydrogenbond(positions, donor, acceptor, hydrogens,
     dist_crit_dha = dist_crit / np.sin(_angle_crit) \
         * np.sin((np.pi - _angle_crit) / 2) * 2
 
-    _dist_da = distance_matrix(positions[donor], positions[acceptor],
-                               cell=cell)
-    _eligible = _dist_da <= dist_crit
-
-    # --- loop over eligible pairs and find H atom
+    donor = np.array(donor)
+    acceptor = np.array(acceptor)
     answer = np.zeros((len(donor), len(acceptor))).astype(bool)
-
-    for _d, _a in np.argwhere(_eligible):
-        _ai = acceptor[_a]
-        _di = donor[_d]
-
-        _dist_dah = distance_matrix(positions[[_di, _ai]], positions[_hyd],
-                                    cell=cell)
-        _pre_h = np.argwhere(_dist_dah[0] <= dist_crit_dha / 2.).flatten()
-
-        if len(_pre_h) == 0:
-            _warnings.warn('No hydrogen atom found at donor %d' % _di,
-                           _ChirPyWarning,
-                           stacklevel=2)
-
-        _h = np.argmin(_dist_dah[1, _pre_h])
-        _hi = _hyd[_pre_h][_h]
-
-        if _dist_dah[:, _pre_h[_h]].sum(axis=0) <= dist_crit_dha:
-            _angle_dah = angle_pbc(*positions[[_di, _hi, _ai]], cell=cell)
-            if _angle_dah >= _angle_crit:
-                answer[_d, _a] = True
+    if len(donor) == 0 or len(acceptor) == 0:
+        return answer
+
+    # --- eligible pairs (local search), processed all at once (no
+    #     self-pairs for overlapping donor/acceptor sets)
+    _d, _a, _ = _neighbour_pairs(positions[donor], positions[acceptor],
+                                 dist_crit, cell=cell)
+    _other = donor[_d] != acceptor[_a]
+    _d, _a = _d[_other], _a[_other]
+    if len(_d) == 0:
+        return answer
+
+    # --- NB: squared distances unless summed up (skips sqrt)
+    _dist_dh = distance_matrix(positions[donor], positions[_hyd], cell=cell,
+                               squared=True)
+    if np.array_equal(donor, acceptor):
+        # --- NB: HBs are directed (answer is not symmetric), but the
+        #     hydrogen distances are shared
+        _dist_ah = _dist_dh
+    else:
+        _dist_ah = distance_matrix(positions[acceptor], positions[_hyd],
+                                   cell=cell, squared=True)
+    _pre_h = _dist_dh <= (dist_crit_dha / 2.)**2
+
+    _found = _pre_h.any(axis=1)
+    for _di in donor[np.unique(_d[~_found[_d]])]:
+        _warnings.warn('No hydrogen atom found at donor %d' % _di,
+                       _ChirPyWarning,
+                       stacklevel=2)
+    _d, _a = _d[_found[_d]], _a[_found[_d]]
+
+    # --- per pair: candidate hydrogen closest to the acceptor
+    _h = np.argmin(np.where(_pre_h[_d], _dist_ah[_a], np.inf), axis=1)
+    _hb = np.sqrt(_dist_dh[_d, _h]) + np.sqrt(_dist_ah[_a, _h]) \
+        <= dist_crit_dha
+    _d, _a, _h = _d[_hb], _a[_hb], _h[_hb]
+
+    _angle_dah = angle_pbc(positions[donor[_d]],
+                           positions[_hyd[_h]],
+                           positions[acceptor[_a]],
+                           cell=cell)
+    answer[_d, _a] = _angle_dah >= _angle_crit
 
     return answer
 
@@ -934,29 +1100,35 @@ def guess_atom_types(pos_aa,
         neigh_map … list of neighbour atoms per atom
         atom … current line in reading neighbour map
         atom_count … starts with n_atoms until zero
+
+        Iterative flood fill (no recursion limit for large systems).
         '''
         molecule[atom] = n_mol
         atom_count -= 1
-        for _i in neigh_map[atom]:
-            if molecule[_i] == 0:
-                molecule, atom_count = assign_molecule(
-                    molecule,
-                    n_mol,
-                    n_atoms,
-                    neigh_map,
-                    _i,
-                    atom_count
-                    )
-                # print(atom_count)
-            if atom_count == 0:
-                break
+        _stack = [atom]
+        while _stack and atom_count > 0:
+            for _i in neigh_map[_stack.pop()]:
+                if molecule[_i] == 0:
+                    molecule[_i] = n_mol
+                    atom_count -= 1
+                    _stack.append(_i)
         return molecule, atom_count
 
-    def assign_types(character, kernel):
-        '''general evaluation of similarity kernel'''
-        similarity = np.array([[_i for _i, _ch1 in enumerate(character)
-                                if _ch1 == _ch0]
-                               for _ch0 in character])
+    def assign_types(character, kernel, equivalence=False):
+        '''general evaluation of similarity kernel
+           equivalence … kernel is an equivalence relation (x == y)
+        '''
+        if equivalence:
+            # --- types are the classes of equal characters (numbered by
+            #     first occurrence, as with the flood fill)
+            _types = {}
+            return np.array([_types.setdefault(_ch, len(_types) + 1)
+                             for _ch in character])
+
+        # --- neighbour lists (ragged)
+        similarity = [[_i for _i, _ch1 in enumerate(character)
+                       if kernel(_ch1, _ch0)]
+                      for _ch0 in character]
         n_types = 0
         n_atoms = atom_count = len(character)
 
@@ -979,15 +1151,15 @@ def guess_atom_types(pos_aa,
     if similarity == 'connectivity':
         _core = connectivity(pos_aa, symbols, cell_aa_deg=cell_aa_deg)
 
+        _symbols = np.array(symbols)
+        # --- sorted neighbour symbols per atom
+        _core_chars = [tuple(sorted(_symbols[_s].tolist())) for _s in _core]
         _character = [(_s,) for _s in symbols]
         if order > 0:
-            _character = [_ch + tuple(sorted(np.array(symbols)[_s]))
-                          for _ch, _s in zip(_character, _core)]
+            _character = [_ch + _cc
+                          for _ch, _cc in zip(_character, _core_chars)]
         if order > 1:
-            _character = [_ch + tuple(sorted(
-                                        [tuple(sorted(np.array(symbols)[_ss]))
-                                         for _ss in _core[_s]]
-                                        ))
+            _character = [_ch + tuple(sorted(_core_chars[_ss] for _ss in _s))
                           for _ch, _s in zip(_character, _core)]
 
         def _kernel(x, y):
@@ -999,6 +1171,7 @@ def guess_atom_types(pos_aa,
     else:
         raise ValueError('Unknown similarity kernel: %s' % similarity)
 
-    atom_types = assign_types(_character, _kernel)
+    atom_types = assign_types(_character, _kernel,
+                              equivalence=similarity == 'connectivity')
 
     return atom_types
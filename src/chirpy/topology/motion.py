@@ -129,6 +129,30 @@ def _acf_i(h):
     return B / B[0]
 
 
+def hydrogen_bond_occurrence(positions, donor, acceptor, hydrogen,
+                             dist_crit=3.0,
+                             angle_crit=130,
+                             cell=None):
+    '''Evaluate ishydrogenbond for all frames of a trajectory
+       (parallel run over frames).
+
+       positions:        position array of shape (n_frames, n_atoms, 3)
+       donor/acceptor:   atom indices of heavy atoms donating/accepting HBs
+       hydrogen:         indices of the (sub)set of hydrogen atoms
+
+       returns:
+       bool array of shape (n_frames, n_donors, n_acceptors)
+       '''
+    return PALARRAY(_func0, positions,
+                    donor=donor,
+                    acceptor=acceptor,
+                    hydrogen=hydrogen,
+                    dist_crit=dist_crit,
+                    angle_crit=angle_crit,
+                    cell=cell
+                    ).run().astype(bool)
+
+
 def hydrogen_bond_lifetime_analysis(positions, donor, acceptor, hydrogen,
                                     dist_crit=3.0,
                                     angle_crit=130,
@@ -154,15 +178,10 @@ def hydrogen_bond_lifetime_analysis(positions, donor, acceptor, hydrogen,
        '''
 
     # --- generate HB occurence trajectory (parallel run)
-    # H = PALARRAY(_func0, positions).run()
-    H = PALARRAY(_func0, positions,
-                 donor=donor,
-                 acceptor=acceptor,
-                 hydrogen=hydrogen,
-                 dist_crit=dist_crit,
-                 angle_crit=angle_crit,
-                 cell=cell
-                 ).run()
+    H = hydrogen_bond_occurrence(positions, donor, acceptor, hydrogen,
+                                 dist_crit=dist_crit,
+                                 angle_crit=angle_crit,
+                                 cell=cell)
     # print('Done with HB occurrence...')
 
     n_frames, n_donors, n_acceptors = H.shape
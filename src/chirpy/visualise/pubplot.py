@@ -62,12 +62,8 @@ class pub_label():
 
     def print(self,  string,  **kwargs):
         args = AttrDict()
-        for _key in self.__dict__.keys():
-            args[_key] = kwargs.get(_key,  getattr(self,  _key))
-            try:
-                del kwargs[_key]
-            except KeyError:
-                pass
+        for _key in self.__dict__:
+            args[_key] = kwargs.pop(_key,  getattr(self,  _key))
         self.ax.text(args.X,  args.Y + args.pad,  args.stancil % string,
                      color=args.color,  alpha=args.alpha,  size=args.size,
                      **kwargs)
@@ -85,18 +81,22 @@ def source_params(matplotlib):
     # 'grid.linewidth':4,
     # 'grid.color':'0.8',
     # })
-    matplotlib.rc('xtick',  labelsize=22)
-    matplotlib.rc('ytick',  labelsize=22)
-    matplotlib.rc('font',   size=22)
+    # --- collect settings and apply them with one rcParams update
+    _params = {
+        'xtick.labelsize': 22,
+        'ytick.labelsize': 22,
+        'font.size': 22,
+        'mathtext.fontset': 'stixsans',
+        'mathtext.default': 'regular',
+        }
 
     # matplotlib.rcParams['pdf.fonttype'] = 42
     # matplotlib.rcParams['ps.fonttype'] = 42
     # matplotlib.rc('font',
     # **{'family':'sans-serif', 'sans-serif':['Helvetica']}) #gives warning
-    matplotlib.rcParams['mathtext.fontset'] = 'stixsans'
     if os.system('latex' + ' 1>/dev/null 2>/dev/null') != 0:
-        matplotlib.rc('text',  usetex=True)
-        matplotlib.rcParams['text.latex.preamble'] = r'''
+        _params['text.usetex'] = True
+        _params['text.latex.preamble'] = r'''
 \usepackage[utf8]{inputenc}
 \usepackage{upgreek}
 \usepackage{bm}
@@ -109,7 +109,7 @@ def source_params(matplotlib):
 '''
     else:
         warnings.warn('LaTeX not found.', ChirPyWarning, stacklevel=2)
-    matplotlib.rcParams.update({'mathtext.default':  'regular'})
+    matplotlib.rcParams.update(_params)
 
 
 def make_nice_ax(p):
@@ -169,6 +169,41 @@ def set_mutliple_y_axes(ax, sep, n_axes,
         return aux_ax
 
 
+def _monotonic(x):
+    '''1 for strictly ascending x, -1 for strictly descending x,
+       0 otherwise'''
+    _dx = np.diff(x)
+    if len(_dx) > 0 and np.all(_dx > 0):
+        return 1
+    if len(_dx) > 0 and np.all(_dx < 0):
+        return -1
+    return 0
+
+
+def _nearest_index(x, value, order):
+    '''Index of the entry of x closest to value (first one on ties).
+       Binary search for ascending x (order from _monotonic), linear
+       scan otherwise.'''
+    if order == 1:
+        _i = np.searchsorted(x, value)
+        if _i == 0:
+            return 0
+        if _i == len(x) or value - x[_i - 1] <= x[_i] - value:
+            # --- first occurrence of repeated values
+            return np.searchsorted(x, x[_i - 1])
+        return _i
+    return np.argmin(np.abs(x - value))
+
+
+def _visible_window(slc, order):
+    '''Extend the xlim window slc by one point beyond each edge for
+       monotonic x (order from _monotonic; lines then reach the axes
+       limits); all points otherwise.'''
+    if order != 0:
+        return slice(max(slc.start - 1, 0), slc.stop + 2)
+    return slice(None)
+
+
 def multiplot(
              ax,
              x_a,
@@ -196,10 +231,13 @@ def multiplot(
              xlim=None,
              ylim=None,
              gaussian_filter=None,
+             rasterized=False,
              **kwargs):
     '''Make a nice plot of data in list.
        Arguments with _a denote list of values corresponding to data list y_a
        kwargs contains argument for pyplot
+       rasterized=True draws all lines and filled areas as bitmaps in
+       vector output (small files for dense data)
        '''
     if gaussian_filter is None:
         y_a = copy.deepcopy(Y_a)
@@ -217,8 +255,11 @@ def multiplot(
         e,  xe = exp[:,  1],  exp[:,  0]
 
     if xlim is None:
-        xlim = (np.amin(np.array(np.hstack(x_a))),
-                np.amax(np.array(np.hstack(x_a))))
+        if isinstance(x_a, (list, tuple)):
+            xlim = (min(np.amin(_x) for _x in x_a),
+                    max(np.amax(_x) for _x in x_a))
+        else:
+            xlim = (np.amin(x_a), np.amax(x_a))
 
     # --- ToDo: create class attributes
     def _listify(xx):
@@ -272,18 +313,20 @@ def multiplot(
     if any(len(_a) != n_plots for _a in [y_a,  bool_a]):
         raise ValueError('Inconsistent no. of plots in lists!')
 
-    _slc = [slice(*sorted(np.argmin(np.abs(_x_a-_x)) for _x in xlim))
-            for _x_a in x_a]
+    # --- check monotonicity of x once per array
+    _ord = [_monotonic(_x_a) for _x_a in x_a]
+    _slc = [slice(*sorted(_nearest_index(_x_a, _x, _o) for _x in xlim))
+            for _x_a, _o in zip(x_a, _ord)]
     if exp is not None:
-        _slce = slice(*sorted(np.argmin(np.abs(xe-_x)) for _x in xlim))
+        _orde = _monotonic(xe)
+        _slce = slice(*sorted(_nearest_index(xe, _x, _orde) for _x in xlim))
 
     # --- Calculate hspace per plot and ylim
     if hspace is None:
         try:
-            _shift = max([np.amax(_y[_s]) - np.amin(_y[_s])
-                          for _y, _s in zip(y_a, _slc)])
+            _shift = max([np.ptp(_y[_s]) for _y, _s in zip(y_a, _slc)])
             if exp is not None:
-                _shift = max(np.amax(e[_slce]) - np.amin(e[_slce]), _shift)
+                _shift = max(np.ptp(e[_slce]), _shift)
             _shift *= (1 + sep / 100)
 
         except ValueError:
@@ -294,7 +337,6 @@ def multiplot(
         _shift = hspace
 
     if stack_plots:
-        print(_shift)
         if not fill_between:
             _y_a = [_y-_shift*_i for _i, _y in enumerate(y_a)]
             if exp is not None:
@@ -309,8 +351,9 @@ def multiplot(
             _e = e
 
     if ylim is None:  # add routine for pile_up option
-        ylim = (min([np.amin(_y[_s]) for _y, _s in zip(_y_a, _slc)]),
-                max([np.amax(_y[_s]) for _y, _s in zip(_y_a, _slc)]))
+        _y_win = [_y[_s] for _y, _s in zip(_y_a, _slc)]
+        ylim = (min([np.amin(_y) for _y in _y_win]),
+                max([np.amax(_y) for _y in _y_win]))
         if exp is not None:
             ylim = (min(ylim[0], np.amin(_e[_slce])),
                     max(ylim[1], np.amax(_e[_slce])))
@@ -319,12 +362,26 @@ def multiplot(
     if not stack_plots:
         _shift = 0.0
 
+    # --- pass only the visible part of the data to the backend
+    _vis = [_visible_window(_s, _o) for _s, _o in zip(_slc, _ord)]
+    x_a = [_x[_v] for _x, _v in zip(x_a, _vis)]
+    _y_a = [_y[_v] for _y, _v in zip(_y_a, _vis)]
+    offset_a = [_o[_v] if np.ndim(_o) > 0 else _o
+                for _o, _v in zip(offset_a, _vis)]
+    if _fill_range:
+        std_a = [_sd[_v] if np.ndim(_sd) > 0 else _sd
+                 for _sd, _v in zip(std_a, _vis)]
+    if exp is not None:
+        _v = _visible_window(_slce, _orde)
+        xe, _e = xe[_v], _e[_v]
+
     # --- plot reference (experiment)
     if exp is not None:
         ax.plot(xe, _e, style_exp, alpha=alpha_exp, lw=lw_exp, color='black',
-                label='exp.')
+                label='exp.', rasterized=rasterized)
 
     # --- plot data
+    kwargs['rasterized'] = rasterized
     if _fill_range:
         for _b, _x, _y, _st, _c, _al, _lw, _s, _fal, _fc, _o in zip(
                                                                bool_a,
@@ -341,13 +398,15 @@ def multiplot(
             if _b:
                 if _fc is None:
                     _fc = _c
-                ax.fill_between(_x, _y+_o+_s, _y+_o-_s, color=_fc, alpha=_fal)
-                ax.plot(_x, _y+_o, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
+                _yo = _y + _o
+                ax.fill_between(_x, _yo + _s, _yo - _s, color=_fc, alpha=_fal,
+                                rasterized=rasterized)
+                ax.plot(_x, _yo, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
 
     elif fill_between:
         if n_plots <= 1:
             raise ValueError('fill_between requires at least two data sets')
-        if not np.allclose(np.unique(x_a),  x_a[0]):
+        if not all(np.allclose(_x, x_a[0]) for _x in x_a[1:]):
             raise ValueError('fill_between requires identical x attributes')
 
         _y_1 = None
@@ -370,7 +429,8 @@ def multiplot(
                     _fc = _c
                 if _iset > 0:
                     ax.fill_between(_x, _y+_o, _y_1+_o_1, color=_fc,
-                                    alpha=_fal, lw=0, hatch=_ha)
+                                    alpha=_fal, lw=0, hatch=_ha,
+                                    rasterized=rasterized)
                 ax.plot(_x, _y+_o, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
             _y_1 = copy.deepcopy(_y)
             _o_1 = copy.deepcopy(_o)
@@ -392,33 +452,39 @@ def multiplot(
             if _b:
                 if _fc is None:
                     _fc = _c
-                ax.fill_between(_x, _y+_o, _o-_shift*_iset, color=_fc,
-                                alpha=_fal, lw=0, hatch=_ha)
-                ax.plot(_x, _y+_o, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
+                _yo = _y + _o
+                ax.fill_between(_x, _yo, _o-_shift*_iset, color=_fc,
+                                alpha=_fal, lw=0, hatch=_ha,
+                                rasterized=rasterized)
+                ax.plot(_x, _yo, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
 
     elif pile_up:
-        if not np.allclose(np.unique(x_a),  x_a[0]):
+        if not all(np.allclose(_x, x_a[0]) for _x in x_a[1:]):
             raise ValueError('pile_up requires identical x attributes')
-        _last = np.zeros_like(_y_a[0])
-        for _b, _x, _y, _st, _ha, _c, _al, _lw, _fal, _fc, _o in zip(
+        # --- upper and lower bounds of all (active) layers at once
+        _upper = np.cumsum([_y + _o if _b else np.zeros_like(_y)
+                            for _b, _y, _o in zip(bool_a, _y_a, offset_a)],
+                           axis=0)
+        _lower = np.concatenate((np.zeros_like(_upper[:1]), _upper[:-1]))
+        for _b, _x, _l, _u, _st, _ha, _c, _al, _lw, _fal, _fc in zip(
                                                                 bool_a,
                                                                 x_a,
-                                                                _y_a,
+                                                                _lower,
+                                                                _upper,
                                                                 style_a,
                                                                 hatch_a,
                                                                 color_a,
                                                                 alpha_a,
                                                                 lw_a,
                                                                 fill_alpha_a,
-                                                                fill_color_a,
-                                                                offset_a):
+                                                                fill_color_a):
             if _b:
                 if _fc is None:
                     _fc = _c
-                ax.fill_between(_x, _last, _last + _y+_o,
-                                lw=0, color=_fc, alpha=_fal,  hatch=_ha)
-                _last += _y+_o
-                ax.plot(_x, _last, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
+                ax.fill_between(_x, _l, _u,
+                                lw=0, color=_fc, alpha=_fal,  hatch=_ha,
+                                rasterized=rasterized)
+                ax.plot(_x, _u, _st, lw=_lw, color=_c, alpha=_al, **kwargs)
     else:
         for _b, _x, _y, _st, _c, _al, _lw, _o in zip(bool_a,
                                                      x_a,
@@ -436,11 +502,13 @@ def multiplot(
     ax.set_xlim(*xlim)
     ax.set_ylim(*ylim)
 
+    _xmid = (xlim[0] + xlim[1]) / 2
+    _ymid = (ylim[0] + ylim[1]) / 2
     if stack_plots:
         LB = [pub_label(
                         ax,
                         color=_c,
-                        X=np.mean(xlim),
+                        X=_xmid,
                         Y=-_shift * _i,
                         alpha=_al,
                         pad=0.2 * _shift
@@ -448,7 +516,7 @@ def multiplot(
                  + [pub_label(
                         ax,
                         color='black',
-                        X=np.mean(xlim),
+                        X=_xmid,
                         Y=-n_plots * _shift,
                         pad=0.2 * _shift,
                         stancil=r'\emph{%s}'
@@ -457,18 +525,23 @@ def multiplot(
     else:
         LB = [pub_label(ax,
                         color=_c,
-                        X=np.mean(xlim),
-                        Y=np.mean(ylim),
+                        X=_xmid,
+                        Y=_ymid,
                         alpha=_al) for _c, _al in zip(color_a, alpha_a)] \
              + [pub_label(ax,
                           color='black',
-                          X=np.mean(xlim),
-                          Y=np.mean(ylim),
+                          X=_xmid,
+                          Y=_ymid,
                           stancil=r'\emph{%s}')] * (exp is not None)
 
     return LB
 
 
+def _broadcast(x, n):
+    '''Repeat a single (non-list) argument for n plots.'''
+    return x if isinstance(x, list) else [x] * n
+
+
 def histogram(ax_a, data_a,
               color_a=['#607c8e', '#c85a53', '#7ea07a', '#c4a661', '#3c4142'],
               alpha_a=1.0,
@@ -486,18 +559,17 @@ def histogram(ax_a, data_a,
     n_plots = len(data_a)
     xlim = kwargs.get('range')
 
-    if color_a.__class__ is not list:
-        color_a = [color_a] * n_plots
-    if alpha_a.__class__ is not list:
-        alpha_a = [alpha_a] * n_plots
-    if bool_a.__class__ is not list:
-        bool_a = [bool_a] * n_plots
+    color_a, alpha_a, bool_a = (_broadcast(_a, n_plots)
+                                for _a in (color_a, alpha_a, bool_a))
 
+    # --- constant weights: one filled array or a read-only broadcast view
     if sum_to_one:
-        weights_a = [np.ones_like(_d) / _d.shape[0] for _d in data_a]
+        weights_a = [np.full(_d.shape, 1 / _d.shape[0]) for _d in data_a]
     else:
         if weights_a is None:
-            weights_a = [np.ones_like(_d) for _d in data_a]
+            weights_a = [np.broadcast_to(
+                             np.ones((), dtype=np.asarray(_d).dtype),
+                             np.shape(_d)) for _d in data_a]
 
     # ToDo: missing keys: facecolor, edgecolor
 
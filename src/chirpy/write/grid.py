@@ -30,6 +30,8 @@
 
 # outbuffer method may result in memory outage ==> Replace it
 
+import numpy as _np
+
 from .. import constants
 
 
@@ -100,12 +102,12 @@ def _assemble_cube_file(comment1,
                                                             coords[atom][2]
                                                             )
 
+    # --- one format string per x-plane with 6 values per line;
+    #     format plane by plane to bound the temporary memory
+    _row = '\n'.join('%13.5E' * min(6, dim[2] - _i)
+                     for _i in range(0, dim[2], 6)) + '\n'
+    _plane = _row * dim[1]
     for i_x in range(dim[0]):
-        for i_y in range(dim[1]):
-            for i_z in range(dim[2]):
-                if i_z % 6 == 0 and i_z != 0:
-                    obuffer += '\n'
-                obuffer += '%13.5E' % data[i_x][i_y][i_z]
-            obuffer += '\n'
+        obuffer += _plane % tuple(_np.ravel(data[i_x]).tolist())
 
     return obuffer
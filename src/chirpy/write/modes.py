@@ -29,21 +29,20 @@
 # ----------------------------------------------------------------------
 
 
+import numpy as np
+
+
 def xvibsWriter(filename, n_atoms, numbers, pos_aa, freqs, modes):
     '''Write an XVIBS file with Cartesian displacements in angstrom'''
 
-    obuffer = '&XVIB\n NATOMS\n %d\n COORDINATES\n' % n_atoms
-    for n, r in zip(numbers, pos_aa):
-        obuffer += ' %d  %16.12f  %16.12f  %16.12f\n' % tuple([n] + list(r))
-    obuffer += ' FREQUENCIES\n %d\n' % len(freqs)
-    for f in freqs:
-        obuffer += ' %16.12f\n' % f
-    obuffer += ' MODES\n'
     n_modes, atoms, three = modes.shape
-    modes = modes.reshape((n_modes * atoms, 3))
-    for mode in modes:
-        obuffer += ' %16.12f  %16.12f  %16.12f\n' % tuple(mode)
-    obuffer += '&END\n'
-
     with open(filename, 'w') as f:
-        f.write(obuffer)
+        f.write('&XVIB\n NATOMS\n %d\n COORDINATES\n' % n_atoms)
+        f.writelines([' %d  %16.12f  %16.12f  %16.12f\n' % (n, *r)
+                      for n, r in zip(numbers, pos_aa)])
+        f.write(' FREQUENCIES\n %d\n' % len(freqs))
+        np.savetxt(f, np.reshape(freqs, (-1, 1)), fmt=' %16.12f')
+        f.write(' MODES\n')
+        np.savetxt(f, modes.reshape((n_modes * atoms, 3)),
+                   fmt=' %16.12f  %16.12f  %16.12f')
+        f.write('&END\n')
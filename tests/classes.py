@@ -43,10 +43,12 @@ _test_dir = os.path.dirname(os.path.abspath(__file__)) + '/.test_files'
 
 
 def _func(x0, x1):
-    # --- some example array manipulation
-    r0 = x0 + x1.swapaxes(1, 2)
-    r0 = np.linalg.norm(r0, axis=-2)
-    return r0.T
+    # --- some example array manipulation: norm of x0 + x1.swapaxes(1, 2)
+    #     along axis -2 with the square expanded (no summed temporary)
+    x1 = x1.swapaxes(1, 2)
+    r0 = np.einsum('ijk,ijk->ik', x0, x0) + np.einsum('ijk,ijk->ik', x1, x1)
+    r0 += 2 * np.einsum('ijk,ijk->ik', x0, x1)
+    return np.sqrt(r0).T
 
 
 class TestCore(unittest.TestCase):
@@ -78,6 +80,8 @@ class TestCore(unittest.TestCase):
         r0 = np.moveaxis(r0, -1, 0)
         r0 = np.moveaxis(r0, -1, 0)
         self.assertTrue(np.allclose(S, r0))
+        JOB = core.PALARRAY(_func, d0, d1, axis=3, backend='thread')
+        self.assertTrue(np.allclose(JOB.run(), r0))
 
 
 class TestTrajectory(unittest.TestCase):
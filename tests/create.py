@@ -31,8 +31,10 @@
 import unittest
 import os
 import filecmp
+import numpy as np
 
 from chirpy.create import supercell
+from chirpy.classes.trajectory import XYZFrame
 
 _test_dir = os.path.dirname(os.path.abspath(__file__)) + '/.test_files'
 
@@ -69,6 +71,42 @@ class TestSupercell(unittest.TestCase):
                                  "Some features of create module not "
                                  "available.")
 
+    def test_box_arithmetic(self):
+        cell = np.array([10., 10., 10., 90., 90., 90.])
+
+        def _box(shift):
+            _pos = np.array([[0., 0., 0.], [0.96, 0., 0.], [-0.24, 0.93, 0.]])
+            _f = XYZFrame(data=np.hstack((_pos + shift, np.zeros((3, 3)))),
+                          symbols=('O', 'H', 'H'), cell_aa_deg=cell)
+            return supercell._BoxObject(members=[(1, _f)], cell_aa_deg=cell)
+
+        # --- molecules outside the cell are wrapped in the combined box
+        a = _box([10.5, 1., 1.])
+        b = _box([-0.6, 5., 5.])
+        _pos_a = a.members[0][1].pos_aa.copy()
+        _pos_b = b.members[0][1].pos_aa.copy()
+        c = a + b
+        self.assertEqual(c.n_members, 2)
+        c = a * 2
+        self.assertEqual(c.n_members, 2)
+        self.assertTrue(np.array_equal(a.members[0][1].pos_aa, _pos_a))
+        self.assertTrue(np.array_equal(b.members[0][1].pos_aa, _pos_b))
+
+    def test_box_member_grouping(self):
+        cell = np.array([40., 40., 40., 90., 90., 90.])
+
+        def _frame(length):
+            _pos = np.array([[5., 5., 5.], [5. + length, 5., 5.]])
+            return XYZFrame(data=np.hstack((_pos, np.zeros((2, 3)))),
+                            symbols=('C', 'C'), cell_aa_deg=cell)
+
+        # --- equality is not transitive: 1~7 and 7~13, but not 1~13;
+        #     members connected via a chain form one species
+        _members = [(1, _frame(_l)) for _l in (1., 13., 7.)]
+        b = supercell._BoxObject(members=_members, cell_aa_deg=cell)
+        self.assertEqual(len(b.member_set), 1)
+        self.assertEqual(b.member_set[0][0], 3)
+
     def test_molecular_crystal(self):
         c = supercell.MolecularCrystal(self.dir + '/782512.pdb')
 
@@ -113,32 +113,33 @@ class TestStatisticalMechanics(unittest.TestCase):
         vel_si = np.linspace(0, 2500, 10)
         vel_au = vel_si * constants.v_si2au
 
-        He = list(map(He, vel_au))
-        Ne = list(map(Ne, vel_au))
-        Ar = list(map(Ar, vel_au))
+        He = He(vel_au)
+        Ne = Ne(vel_au)
+        Ar = Ar(vel_au)
 
-        self.assertAlmostEqual(
+        # --- reference values generated with the current constants
+        np.testing.assert_allclose(
             He,
-            [0.0, 259.64351675199623, 861.543369563816,
-             1419.6864797977644, 1631.9085469653362, 1455.5758919071563,
-             1056.3539740488634, 639.7470438031493,
-             328.23926631882813, 144.07447416251298],
-            places=10)
-        self.assertAlmostEqual(
+            [0.0, 259.64304141447303, 861.542007155871,
+             1419.6848248210904, 1631.9075941579051, 1455.5761310033552,
+             1056.3551134699392, 639.7484251832599,
+             328.2403843462032, 144.07516849527147],
+            rtol=0, atol=1E-10)
+        np.testing.assert_allclose(
             Ne,
-            [0.0, 2285.0583431608047, 3562.659032223463,
-             1667.1898975979307,
-             328.9289905273825, 30.434985841657625, 1.384834386413647,
-             0.031780811151197186,
-             0.0003734511042990659, 2.269002561323683e-06],
-            places=10)
-        self.assertAlmostEqual(
+            [0.0, 2285.0549275253693, 3562.658186060435,
+             1667.1929951184518,
+             328.930566606905, 30.435246467390794, 1.3848526293486694,
+             0.03178140296043735,
+             0.00037346040623243787, 2.269075243650555e-06],
+            rtol=0, atol=1E-10)
+        np.testing.assert_allclose(
             Ar,
-            [0.0, 4679.204911222703, 2898.4766305923536, 291.23835364271923,
-             6.667772676402412, 0.03869136521866931, 5.9668935143188504e-05,
-             2.5082574248733346e-08,
-             2.917727567102299e-12, 9.484119560358289e-17],
-            places=10)
+            [0.0, 4679.199838087012, 2898.4807024358156, 291.2399709431052,
+             6.667848428445446, 0.03869209370207436, 5.9670603166880824e-05,
+             2.5083545965395788e-08,
+             2.917876914815695e-12, 9.484738792921146e-17],
+            rtol=0, atol=1E-10)
 
     def test_spectral_density(self):
         P = 100
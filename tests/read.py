@@ -104,6 +104,13 @@ class TestModes(unittest.TestCase):
 
 class TestCoordinates(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # --- reference data used by several tests (parse once)
+        cls.DATA_TRAJ_POS_PBC = np.genfromtxt(
+                _test_dir + '/read_write/data_traj_pos_pbc'
+                ).reshape(3, 393, 3)
+
     def setUp(self):
         # Change paths after moving file
         self.dir = _test_dir + '/read_write'
@@ -185,10 +192,7 @@ class TestCoordinates(unittest.TestCase):
         data, symbols, comments = r_coordinates.xyzReader(
                 self.dir + '/test_traj_pos_pbc.xyz')
         self.assertIsInstance(data, np.ndarray)
-        self.assertTrue(np.array_equal(
-            data,
-            np.genfromtxt(self.dir + '/data_traj_pos_pbc').reshape(3, 393, 3)
-            ))
+        self.assertTrue(np.array_equal(data, self.DATA_TRAJ_POS_PBC))
         self.assertIsInstance(comments, list)
         self.assertTupleEqual(
                 symbols,
@@ -268,20 +272,13 @@ class TestCoordinates(unittest.TestCase):
                 self.dir + '/test_traj_pos_pbc.xyz',
                 range=(1, 1, 3)
                 )
-        self.assertTrue(np.array_equal(
-         data,
-         np.genfromtxt(self.dir + '/data_traj_pos_pbc').reshape(3, 393, 3)[1:3]
-         ))
+        self.assertTrue(np.array_equal(data, self.DATA_TRAJ_POS_PBC[1:3]))
 
         data, symbols, comments = r_coordinates.xyzReader(
                 self.dir + '/test_traj_pos_pbc.xyz',
                 range=(1, 2, 3)
                 )
-        self.assertTrue(np.array_equal(
-         data,
-         np.genfromtxt(self.dir +
-                       '/data_traj_pos_pbc').reshape(3, 393, 3)[1:4:2]
-         ))
+        self.assertTrue(np.array_equal(data, self.DATA_TRAJ_POS_PBC[1:4:2]))
 
     def test_pdbReader(self):
         # not much testing of protein features as this is an external reader
@@ -32,6 +32,9 @@
 import argparse
 import unittest
 import sys
+import io
+import importlib
+from concurrent.futures import ProcessPoolExecutor
 
 import chirpy as cp
 
@@ -48,6 +51,19 @@ import scripts
 
 sys.tracebacklimit = 0
 
+
+def _run_module(name, verbosity):
+    '''Run the tests of one module (worker process) and return its report
+       and the numbers of tests, failures, and errors.'''
+    cp.config.set_verbose(verbosity > 1)
+    _stream = io.StringIO()
+    runner = unittest.TextTestRunner(stream=_stream, verbosity=verbosity)
+    result = runner.run(unittest.TestLoader().loadTestsFromModule(
+                                            importlib.import_module(name)))
+    return (_stream.getvalue(), result.testsRun, len(result.failures),
+            len(result.errors))
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
             description="Run TestSuite",
@@ -65,6 +81,12 @@ if __name__ == '__main__':
                  "The script directory needs to be added to PATH",
             default=False,
             )
+    parser.add_argument(
+            "--parallel",
+            type=int,
+            help="Run test modules in N worker processes (0: serial run)",
+            default=0,
+            )
     args = parser.parse_args()
 
     _verbosity = 1
@@ -82,6 +104,30 @@ if __name__ == '__main__':
     print('Running TestSuite')
     sys.stdout.flush()
 
+    _modules = [imports, read, write, interface, mathematics, topology,
+                physics, classes, create]
+    if args.scripts:
+        _modules.append(scripts)
+
+    if args.parallel > 0:
+        # --- test modules are independent: one module per task
+        _names = [_m.__name__ for _m in _modules]
+        with ProcessPoolExecutor(max_workers=args.parallel) as _ex:
+            _reports = list(_ex.map(_run_module, _names,
+                                    len(_names) * [_verbosity]))
+        for _name, (_report, *_) in zip(_names, _reports):
+            print(f'[{_name}]')
+            print(_report)
+        n_tests, n_failures, n_errors = \
+            [sum(_r[_i] for _r in _reports) for _i in (1, 2, 3)]
+        print(70 * '-')
+        print(f'Ran {n_tests} tests in {len(_names)} modules')
+        if n_failures + n_errors > 0:
+            print(f'FAILED (failures={n_failures}, errors={n_errors})')
+            sys.exit(1)
+        print('OK')
+        sys.exit(0)
+
     # initialize the test suite
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
@@ -82,6 +82,10 @@ class TestMapping(unittest.TestCase):
                        a
                        ))
 
+        # --- tuples keep type and order within groups
+        self.assertEqual(mapping.dec(('a', 'b', 'c', 'd'), (1, 0, 1, 0)),
+                         [('b', 'd'), ('a', 'c')])
+
     def test_cowt(self):
         a = np.array(
                 [[
@@ -105,6 +109,13 @@ class TestMapping(unittest.TestCase):
         self.assertTupleEqual(cowt_b.shape, (3,))
         self.assertListEqual(cowt[1].tolist(), cowt_b.tolist())
 
+        cowt_m = mapping.cowt(a, wt=(1, 1, 3, 4), mask=(1, 0, 1, 0))
+        self.assertTupleEqual(cowt_m.shape, (2, 2, 3))
+        self.assertTrue(np.allclose(
+            cowt_m[:, 1],
+            mapping.cowt(a[:, [0, 2]], wt=(1, 3))
+            ))
+
     def test_cell_vec(self):
         cell_aa_deg = np.array([24.218, 15.92, 13.362, 90.0, 111.95, 90.0])
         cell_vec_aa = np.around(mapping.cell_vec(cell_aa_deg), decimals=3)